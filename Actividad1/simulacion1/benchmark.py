@@ -0,0 +1,64 @@
+"""Per-tick timings for the Game of Life agent engine.
+
+Run from this folder: python benchmark.py [--size 500] [--ticks 5]
+"""
+
+import argparse
+import time
+
+from game_of_life.model import ConwaysGameOfLife
+
+
+def scan_upper_neighbors(agent):
+    """Previous upper_neighbors: scan the 8 neighbors on every call."""
+    left = center = right = 0
+    high_y = agent.y + 1
+    for n in agent.neighbors:
+        if n.y == high_y:
+            if n.x == agent.x - 1:
+                left = 1 if n.is_alive else 0
+            elif n.x == agent.x:
+                center = 1 if n.is_alive else 0
+            elif n.x == agent.x + 1:
+                right = 1 if n.is_alive else 0
+    return (left, center, right)
+
+
+def time_per_tick(function, ticks):
+    """Average wall time in seconds of calling ``function`` once per tick."""
+    start = time.perf_counter()
+    for _ in range(ticks):
+        function()
+    return (time.perf_counter() - start) / ticks
+
+
+def bench_upper_neighbors(size, ticks):
+    """Compare the neighborhood scan against the precomputed references."""
+    model = ConwaysGameOfLife(width=size, height=size, seed=42)
+    agents = list(model.agents)
+
+    def scan():
+        for agent in agents:
+            scan_upper_neighbors(agent)
+
+    def linked():
+        for agent in agents:
+            agent.upper_neighbors()
+
+    scan_time = time_per_tick(scan, ticks)
+    linked_time = time_per_tick(linked, ticks)
+    step_time = time_per_tick(model.step, ticks)
+
+    print(f"upper_neighbors on {size}x{size}, {ticks} ticks")
+    print(f"  scan:   {scan_time * 1000:9.1f} ms/tick")
+    print(f"  linked: {linked_time * 1000:9.1f} ms/tick ({scan_time / linked_time:.1f}x faster)")
+    print(f"  full step with linked neighbors: {step_time * 1000:9.1f} ms/tick")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=500)
+    parser.add_argument("--ticks", type=int, default=5)
+    args = parser.parse_args()
+
+    bench_upper_neighbors(args.size, args.ticks)
@@ -30,23 +30,43 @@ class Cell(FixedAgent):
         self.pos = cell.coordinate
         self.state = init_state
         self._next_state = None
+        self._upper = (None, None, None)
+        self._dependents = [] # Celdas que leen a esta como vecino superior
 
-    def upper_neighbors(self):
-        """Return the values 0/1 of the three upper neighbors."""
-        left = 0
-        center = 0
-        right = 0
+    def link_upper_neighbors(self):
+        """Store direct references to the three upper neighbors, and register
+        this cell as a dependent of each of them.
+
+        They never change during the life of the model, so the neighborhood
+        is scanned only once, when the model is built. A missing neighbor
+        (past the left/right border or above the top row) is stored as None
+        and read as a dead cell.
+        """
+        left = center = right = None
         high_y = self.y + 1 # Fila superior
 
         for n in self.neighbors: # Recorremos los vecinos
             if n.y == high_y: # Si el vecino está en la fila superior
                 if n.x == self.x - 1: # Vecino izquierdo
-                    left = 1 if n.is_alive else 0 # Asignamos 1 si está vivo, 0 si está muerto
+                    left = n
                 elif n.x == self.x: # Vecino central
-                    center = 1 if n.is_alive else 0 # Asignamos 1 si está vivo, 0 si está muerto
+                    center = n
                 elif n.x == self.x + 1: # Vecino derecho
-                    right = 1 if n.is_alive else 0 # Asignamos 1 si está vivo, 0 si está muerto
-        return (left, center, right)
+                    right = n
+        self._upper = (left, center, right)
+
+        for n in self._upper:
+            if n is not None:
+                n._dependents.append(self)
+
+    def upper_neighbors(self):
+        """Return the values 0/1 of the three upper neighbors."""
+        left, center, right = self._upper
+        return (
+            left.state if left is not None else 0,
+            center.state if center is not None else 0,
+            right.state if right is not None else 0,
+        )
 
     def determine_state(self):
         """Compute if the cell will be dead or alive at the next tick.  This is
@@ -61,32 +81,11 @@ class Cell(FixedAgent):
             self._next_state = self.state
             return
 
-        vals = self.upper_neighbors() # Valores de los vecinos superiores
-        key = str(vals[0]) + str(vals[1]) + str(vals[2]) # Cadena para ver su estado
-
-        # A partir de la cadena genera el siguiente estado
-        if key == "111":
-            out = 0
-        elif key == "110":
-            out = 1
-        elif key == "101":
-            out = 0
-        elif key == "100":
-            out = 1
-        elif key == "011":
-            out = 1
-        elif key == "010":
-            out = 0
-        elif key == "001":
-            out = 1
-        else:
-            out = 0
+        left, center, right = self.upper_neighbors() # Valores de los vecinos superiores
+        index = (left << 2) | (center << 1) | right # Posición en la tabla de la regla
 
-        # Actualizamos estado
-        if out == 1:
-            self._next_state = self.ALIVE
-        else:
-            self._next_state = self.DEAD
+        # La tabla de la regla ya contiene el siguiente estado
+        self._next_state = self.model.rule_table[index]
 
     def assume_state(self):
         """Set the state to the new computed state -- computed in step()."""
@@ -0,0 +1,166 @@
+import numpy as np
+from .rules import rule_table
+
+
+def apply_rule(table, upper):
+    """Return the next state of the cells whose upper neighbors are ``upper``.
+
+    Axis 0 of ``upper`` is x, so the same code updates a single row or a
+    whole (width, rows) block. The left/right borders read as dead cells.
+    """
+    index = upper << 1 # Vecino central
+    index[1:] |= upper[:-1] << 2 # Vecino izquierdo
+    index[:-1] |= upper[1:] # Vecino derecho
+    return table[index]
+
+
+class ArrayEngine:
+    """Keeps the whole grid as one uint8 array and steps it with array ops.
+
+    ``cells[x, y]`` holds 0 (DEAD) or 1 (ALIVE), using the same coordinates
+    as the Cell agents, so both engines produce the same generations.
+    """
+
+    def __init__(self, cells, rule=90):
+        """Wrap an initial (width, height) array of 0/1 states."""
+        self.cells = np.ascontiguousarray(cells, dtype=np.uint8)
+        self.table = np.array(rule_table(rule), dtype=np.uint8)
+
+    def step(self):
+        """Compute the next generation of every row from the row above it.
+
+        The top row keeps its state, exactly like Cell.determine_state.
+        """
+        self.cells[:, :-1] = apply_rule(self.table, self.cells[:, 1:])
+
+    def fingerprint(self):
+        """Return the packed bytes of the whole grid."""
+        return np.packbits(self.cells).tobytes()
+
+    def count_alive(self):
+        """Return the number of live cells, without copying the grid."""
+        return int(self.cells.sum())
+
+
+class ScrollEngine:
+    """History mode: only the newest row of the 1D automaton is computed.
+
+    The top row of the initial grid seeds the automaton and generation g is
+    drawn at row ``height - 1 - g``, so after ``height - 1`` steps the grid
+    is the same one the full engines settle on. From then on the view
+    scrolls: the newest generation is the bottom row and the oldest one
+    drops off the top. Rows are kept in a ring buffer where generation g
+    lives in slot ``g % height``; each step writes only the slot of the
+    row that drops off, so a step costs O(width) instead of O(width*height).
+    """
+
+    def __init__(self, cells, rule=90):
+        """Fill the ring buffer from an initial (width, height) array."""
+        cells = np.asarray(cells, dtype=np.uint8)
+        self.height = cells.shape[1]
+        self.table = np.array(rule_table(rule), dtype=np.uint8)
+        self.generation = 0
+
+        # Slot height-1-y guarda la fila y, así la fila superior es la generación 0
+        self.rows = np.ascontiguousarray(cells[:, ::-1].T)
+
+    def step(self):
+        """Compute the next generation from the newest row."""
+        newest = self.rows[self.generation % self.height]
+        self.generation += 1
+        self.rows[self.generation % self.height] = apply_rule(self.table, newest)
+
+    def fingerprint(self):
+        """Return the packed bytes of the newest row.
+
+        The newest row alone decides every later generation, so a repeat
+        of it is a cycle of the automaton.
+        """
+        return np.packbits(self.rows[self.generation % self.height]).tobytes()
+
+    def count_alive(self):
+        """Return the number of live cells in the view.
+
+        The view shows every slot of the buffer, only reordered, so the
+        buffer is summed directly.
+        """
+        return int(self.rows.sum())
+
+    @property
+    def cells(self):
+        """The (width, height) view of the buffer, newest row at the bottom."""
+        newest = max(self.generation, self.height - 1)
+        slots = (newest - np.arange(self.height)) % self.height
+        return self.rows[slots].T
+
+
+class BitPackedEngine:
+    """Stores each row as the bits of a Python int (bit x is cell x).
+
+    Every row is updated with a handful of shifts, ANDs and ORs that work
+    on whole machine words at once, so rows millions of cells wide cost
+    width / 8 bytes each. The rule table is compiled into the minterms
+    (left, center, right patterns) that produce a live cell; Rule 90 is
+    simply ``left ^ right``.
+    """
+
+    def __init__(self, cells, rule=90):
+        """Pack an initial (width, height) array of 0/1 states."""
+        cells = np.asarray(cells, dtype=np.uint8)
+        self.width, self.height = cells.shape
+        self.mask = (1 << self.width) - 1
+        self.rule = rule
+        self.minterms = [index for index, out in enumerate(rule_table(rule)) if out]
+        self.rows = [
+            int.from_bytes(np.packbits(cells[:, y], bitorder="little").tobytes(), "little")
+            for y in range(self.height)
+        ]
+
+    def next_row(self, upper):
+        """Return the packed row that follows the packed row ``upper``.
+
+        Missing neighbors past the left/right border read as dead.
+        """
+        center = upper
+        left = (upper << 1) & self.mask # Bit x toma el vecino x - 1
+        right = upper >> 1 # Bit x toma el vecino x + 1
+        if self.rule == 90:
+            return left ^ right
+
+        mask = self.mask
+        row = 0
+        for index in self.minterms:
+            term = left if index & 4 else ~left
+            term &= center if index & 2 else ~center
+            term &= right if index & 1 else ~right
+            row |= term
+        return row & mask
+
+    def step(self):
+        """Compute the next generation of every row; the top row is kept."""
+        rows = self.rows
+        for y in range(self.height - 1):
+            rows[y] = self.next_row(rows[y + 1])
+
+    def fingerprint(self):
+        """Return the packed bytes of every row."""
+        row_bytes = (self.width + 7) // 8
+        return b"".join(row.to_bytes(row_bytes, "little") for row in self.rows)
+
+    def count_alive(self):
+        """Return the number of live cells, counting the set bits of each row."""
+        return sum(row.bit_count() for row in self.rows)
+
+    @property
+    def cells(self):
+        """Unpack the rows into a (width, height) uint8 array.
+
+        This is also how the page draws a bitpacked model, through
+        ``ConwaysGameOfLife.get_state_array``.
+        """
+        cells = np.empty((self.width, self.height), dtype=np.uint8)
+        row_bytes = (self.width + 7) // 8
+        for y, row in enumerate(self.rows):
+            packed = np.frombuffer(row.to_bytes(row_bytes, "little"), dtype=np.uint8)
+            cells[:, y] = np.unpackbits(packed, count=self.width, bitorder="little")
+        return cells
@@ -1,40 +1,128 @@
+import hashlib
+from contextlib import nullcontext
+
+import numpy as np
 from mesa import Model
 from mesa.discrete_space import OrthogonalMooreGrid
 from .agent import Cell
+from .engine import ArrayEngine, BitPackedEngine, ScrollEngine
+from .profiling import StepProfiler
+from .rules import rule_table
+
+ENGINE_CLASSES = {
+    "numpy": ArrayEngine,
+    "bitpacked": BitPackedEngine,
+    "scroll": ScrollEngine,
+}
+ENGINES = ("agents", *ENGINE_CLASSES)
 
 
 class ConwaysGameOfLife(Model):
     """Represents the 2-dimensional array of cells in Conway's Game of Life."""
 
-    def __init__(self, width=50, height=50, initial_fraction_alive=0.2, seed=None):
-        """Create a new playing area of (width, height) cells."""
-        super().__init__(seed=seed)
+    def __init__(
+        self,
+        width=50,
+        height=50,
+        initial_fraction_alive=0.2,
+        seed=None,
+        rule=90,
+        engine="agents",
+        cycle_history=1024,
+        full_sweep_fraction=0.5,
+        profile=False,
+        trace_allocations=False,
+    ):
+        """Create a new playing area of (width, height) cells.
+
+        ``rule`` is the Wolfram number (0-255) of the elementary automaton
+        each row applies to the row above it; it is compiled once into an
+        8-entry lookup table shared by every cell.
+
+        ``engine`` selects how generations are computed: "agents" keeps one
+        Cell agent per grid cell, "numpy" keeps the whole grid in a single
+        uint8 array (no grid or agents are built) and is meant for grids far
+        larger than the visualization can show. Both give the same
+        generations for the same seed. "bitpacked" gives the same
+        generations too but stores each row as packed bits, for rows
+        millions of cells wide. "scroll" is a history mode that
+        treats the top row as the seed of the 1D automaton and only
+        computes the newest row each step (see ScrollEngine).
 
-        """Grid where cells are connected to their 8 neighbors.
+        ``cycle_history`` is how many past generations are remembered (as
+        hashes of the packed state). When a generation repeats one of them
+        the model stops and reports ``cycle_length`` (1 for a fixed point)
+        and ``transient_length`` (steps before the cycle starts). 0 turns
+        the check off.
 
-        Example for two dimensions:
-        directions = [
-            (-1, -1), (-1, 0), (-1, 1),
-            ( 0, -1),          ( 0, 1),
-            ( 1, -1), ( 1, 0), ( 1, 1),
-        ]
+        With the "agents" engine only the cells below a cell that changed
+        on the last step are evaluated. When more than
+        ``full_sweep_fraction`` of the cells would be evaluated anyway, the
+        step falls back to a full sweep.
+
+        ``profile`` turns on a StepProfiler (``self.profiler``) that records
+        the wall time of each phase of every step and the cells evaluated;
+        ``trace_allocations`` also records allocations with tracemalloc.
         """
-        self.grid = OrthogonalMooreGrid((width, height), capacity=1, torus=True)
-
-        # Place a cell at each location, with some initialized to
-        # ALIVE and some to DEAD.
-        for cell in self.grid.all_cells:
-            Cell(
-                self,
-                cell,
-                init_state=(
-                    Cell.ALIVE
-                    if self.random.random() < initial_fraction_alive
-                    else Cell.DEAD
-                ),
-            )
+        super().__init__(seed=seed)
+
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine {engine!r}, expected one of {ENGINES}")
+
+        self.rule = rule
+        self.rule_table = rule_table(rule)
+        self.width = width
+        self.height = height
+        self.engine = None
+        self.cycle_history = cycle_history
+        self.cycle_length = None
+        self.transient_length = None
+        self._seen = {}
+        self.full_sweep_fraction = full_sweep_fraction
+        self._active = None # None: la siguiente generación evalúa todas las celdas
+        self.profiler = StepProfiler(trace_allocations) if profile else None
+
+        # Every engine draws the initial states in the same order (x first,
+        # then y, like grid.all_cells) so the same seed gives the same grid.
+        states = (
+            Cell.ALIVE if self.random.random() < initial_fraction_alive else Cell.DEAD
+            for _ in range(width * height)
+        )
+
+        cells = np.fromiter(states, dtype=np.uint8, count=width * height)
+        cells = cells.reshape(width, height)
+
+        if engine in ENGINE_CLASSES:
+            self.engine = ENGINE_CLASSES[engine](cells, rule)
+            self.grid = None
+        else:
+            """Grid where cells are connected to their 8 neighbors.
+
+            Example for two dimensions:
+            directions = [
+                (-1, -1), (-1, 0), (-1, 1),
+                ( 0, -1),          ( 0, 1),
+                ( 1, -1), ( 1, 0), ( 1, 1),
+            ]
+            """
+            self.grid = OrthogonalMooreGrid((width, height), capacity=1, torus=True)
+
+            # Place a cell at each location, with some initialized to
+            # ALIVE and some to DEAD.
+            for cell in self.grid.all_cells:
+                Cell(self, cell, init_state=int(cells[cell.coordinate]))
+
+            # Copy of the agent states kept up to date by step(), so reading
+            # the whole grid does not need a pass over every agent.
+            self._cells = cells
+
+            # The upper neighbors of a cell are fixed, so they are linked once
+            # here instead of being searched for on every generation. This
+            # also tells each cell which cells depend on it.
+            self.agents.do("link_upper_neighbors")
 
         self.running = True
+        self._record_generation()
 
     def step(self):
         """Perform the model step in two stages:
@@ -42,5 +130,93 @@ class ConwaysGameOfLife(Model):
         - First, all cells assume their next state (whether they will be dead or alive)
         - Then, all cells change state to their next state.
         """
-        self.agents.do("determine_state")
-        self.agents.do("assume_state")
+        if self.profiler is not None:
+            self.profiler.start_step(self.steps)
+
+        if self.engine is not None:
+            with self.profile_phase("engine_step"):
+                self.engine.step()
+            cells_evaluated = self.width if isinstance(self.engine, ScrollEngine) else self.width * self.height
+        else:
+            cells_evaluated = self._step_agents()
+
+        with self.profile_phase("cycle_check"):
+            self._record_generation()
+
+        if self.profiler is not None:
+            self.profiler.end_step(cells_evaluated)
+
+    def profile_phase(self, name):
+        """Context manager that times ``name`` when profiling is on."""
+        if self.profiler is None:
+            return nullcontext()
+        return self.profiler.phase(name)
+
+    def _step_agents(self):
+        """Run both stages only on the cells whose upper neighbors changed.
+
+        A cell whose inputs did not change would compute the state it
+        already has, so only the dependents of the cells that flipped on
+        the last step are evaluated. The first step, and any step where
+        too many cells are active, sweeps the whole grid instead.
+
+        Returns the number of cells evaluated.
+        """
+        active = self._active
+        with self.profile_phase("determine_state"):
+            if active is None or len(active) > self.full_sweep_fraction * len(self.agents):
+                active = self.agents
+                self.agents.do("determine_state")
+            else:
+                for cell in active:
+                    cell.determine_state()
+
+        with self.profile_phase("assume_state"):
+            changed = [cell for cell in active if cell._next_state != cell.state]
+            for cell in changed:
+                cell.assume_state()
+                self._cells[cell.pos] = cell.state
+
+        with self.profile_phase("agent_set"):
+            self._active = {dependent for cell in changed for dependent in cell._dependents}
+
+        return len(active)
+
+    def _record_generation(self):
+        """Remember the current generation and stop if it was already seen.
+
+        Only the first repeat is reported: stepping a stopped model (the
+        page's Step button still can) keeps the cycle it was stopped on.
+        """
+        if not self.cycle_history or self.cycle_length is not None:
+            return
+
+        if self.engine is not None:
+            packed = self.engine.fingerprint()
+        else:
+            packed = np.packbits(self._cells).tobytes()
+        key = hashlib.blake2b(packed, digest_size=16).digest()
+
+        first_seen = self._seen.get(key)
+        if first_seen is not None:
+            self.transient_length = first_seen
+            self.cycle_length = self.steps - first_seen
+            self.running = False
+            return
+
+        self._seen[key] = self.steps
+        if len(self._seen) > self.cycle_history:
+            # Los diccionarios guardan el orden de inserción: el primero es el más viejo
+            del self._seen[next(iter(self._seen))]
+
+    def count_alive(self):
+        """Return the number of live cells without building the state array."""
+        if self.engine is not None:
+            return self.engine.count_alive()
+        return int(self._cells.sum())
+
+    def get_state_array(self):
+        """Return a (width, height) uint8 array with the state of every cell."""
+        if self.engine is not None:
+            return self.engine.cells.copy()
+        return self._cells.copy()
@@ -0,0 +1,11 @@
+def rule_table(rule):
+    """Compile a Wolfram elementary rule number (0-255) into a lookup table.
+
+    Entry ``(left << 2) | (center << 1) | right`` of the returned tuple is
+    the next state (0 or 1) of a cell whose three upper neighbors have
+    those values, so evaluating any rule is a single index.
+    """
+    if not 0 <= rule <= 255:
+        raise ValueError(f"Rule must be between 0 and 255, got {rule}")
+
+    return tuple((rule >> index) & 1 for index in range(8))
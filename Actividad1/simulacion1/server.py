@@ -1,23 +1,52 @@
-from game_of_life.model import ConwaysGameOfLife
-from mesa.visualization import (
-    SolaraViz,
-    make_space_component,
-)
-
-from mesa.visualization.components import AgentPortrayalStyle
+import io
 
-def agent_portrayal(agent):
-    return AgentPortrayalStyle(
-        color="white" if agent.state == 0 else "black",
-        marker="s",
-        size=30,
-    )
+import solara
+from game_of_life.model import ConwaysGameOfLife, ENGINES
+from matplotlib.figure import Figure
+from mesa.visualization import SolaraViz
+from mesa.visualization.utils import update_counter
 
 def post_process(ax):
     ax.set_aspect("equal")
     ax.set_xticks([])
     ax.set_yticks([])
 
+def make_state_figure(model):
+    """Build the figure once; later updates only replace the image data."""
+    figure = Figure()
+    ax = figure.add_subplot()
+    image = ax.imshow(
+        model.get_state_array().T,
+        cmap="binary",
+        vmin=0,
+        vmax=1,
+        origin="lower",
+        interpolation="nearest",
+    )
+    post_process(ax)
+    return figure, image
+
+@solara.component
+def StateImage(model):
+    """Draw the whole grid as a single image, one pixel per cell."""
+    update_counter.get()
+    figure, image = solara.use_memo(lambda: make_state_figure(model), dependencies=[model])
+    # The PNG is encoded here, inside the phase, so "render" times the
+    # whole drawing and not only the creation of the element.
+    with model.profile_phase("render"):
+        image.set_data(model.get_state_array().T)
+        png = io.BytesIO()
+        figure.savefig(png, format="png")
+    solara.Image(png.getvalue())
+
+@solara.component
+def ProfileReport(model):
+    """Show the profiler summary (phases, including render) when profiling is on."""
+    update_counter.get()
+    if model.profiler is None:
+        return
+    solara.Preformatted(model.profiler.summary())
+
 model_params = {
     "seed": {
         "type": "InputText",
@@ -29,7 +58,7 @@ model_params = {
         "value": 50,
         "label": "Width",
         "min": 5,
-        "max": 60,
+        "max": 1000,
         "step": 1,
     },
     "height": {
@@ -37,7 +66,21 @@ model_params = {
         "value": 50,
         "label": "Height",
         "min": 5,
-        "max": 60,
+        "max": 1000,
+        "step": 1,
+    },
+    "engine": {
+        "type": "Select",
+        "value": "numpy",
+        "label": "Engine",
+        "values": list(ENGINES),
+    },
+    "rule": {
+        "type": "SliderInt",
+        "value": 90,
+        "label": "Rule",
+        "min": 0,
+        "max": 255,
         "step": 1,
     },
     "initial_fraction_alive": {
@@ -48,20 +91,24 @@ model_params = {
         "max": 1,
         "step": 0.01,
     },
+    "profile": {
+        "type": "Checkbox",
+        "value": False,
+        "label": "Profile steps",
+    },
+    "trace_allocations": {
+        "type": "Checkbox",
+        "value": False,
+        "label": "Trace allocations",
+    },
 }
 
 # Create initial model instance
-gof_model = ConwaysGameOfLife()
-
-space_component = make_space_component(
-        agent_portrayal,
-        draw_grid = False,
-        post_process=post_process
-)
+gof_model = ConwaysGameOfLife(engine="numpy")
 
 page = SolaraViz(
     gof_model,
-    components=[space_component],
+    components=[StateImage, ProfileReport],
     model_params=model_params,
     name="Game of Life",
 )
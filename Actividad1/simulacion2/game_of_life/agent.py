@@ -30,10 +30,18 @@ class Cell(FixedAgent):
         self.pos = cell.coordinate
         self.state = init_state
         self._next_state = None
+        self._upper = (None, None, None)
+        self._dependents = [] # Celdas que leen a esta como vecino superior
 
-    def upper_neighbors(self):
-        """Return the values 0/1 of the three upper neighbors."""
-        left = center = right = 0 # Valores iniciales
+    def link_upper_neighbors(self):
+        """Store direct references to the three upper neighbors, and register
+        this cell as a dependent of each of them.
+
+        They never change during the life of the model, so the neighborhood
+        is scanned (and the torus wrap-around computed) only once, when the
+        model is built.
+        """
+        left = center = right = None
         H = self.model.grid.height 
         W = self.model.grid.width
 
@@ -45,12 +53,21 @@ class Cell(FixedAgent):
         for n in self.neighbors: 
             if n.y == uy: 
                 if n.x == lx:
-                    left = 1 if n.is_alive else 0 
+                    left = n
                 elif n.x == cx:
-                    center = 1 if n.is_alive else 0
+                    center = n
                 elif n.x == rx:
-                    right = 1 if n.is_alive else 0
-        return (left, center, right)
+                    right = n
+        self._upper = (left, center, right)
+
+        for n in self._upper:
+            if n is not None:
+                n._dependents.append(self)
+
+    def upper_neighbors(self):
+        """Return the values 0/1 of the three upper neighbors."""
+        left, center, right = self._upper
+        return (left.state, center.state, right.state)
 
     def determine_state(self):
         """Compute if the cell will be dead or alive at the next tick.  This is
@@ -61,32 +78,11 @@ class Cell(FixedAgent):
         """
         # Get the neighbors and apply the rules on whether to be alive or dead
         # at the next tick.
-        vals = self.upper_neighbors() # Valores de los vecinos superiores
-        key = str(vals[0]) + str(vals[1]) + str(vals[2]) # Cadena para ver su estado
-
-        # A partir de la cadena genera el siguiente estado
-        if key == "111":
-            out = 0
-        elif key == "110":
-            out = 1
-        elif key == "101":
-            out = 0
-        elif key == "100":
-            out = 1
-        elif key == "011":
-            out = 1
-        elif key == "010":
-            out = 0
-        elif key == "001":
-            out = 1
-        else:
-            out = 0
+        left, center, right = self.upper_neighbors() # Valores de los vecinos superiores
+        index = (left << 2) | (center << 1) | right # Posición en la tabla de la regla
 
-        # Actualizamos estado
-        if out == 1:
-            self._next_state = self.ALIVE
-        else:
-            self._next_state = self.DEAD
+        # La tabla de la regla ya contiene el siguiente estado
+        self._next_state = self.model.rule_table[index]
 
     def assume_state(self):
         """Set the state to the new computed state -- computed in step()."""
@@ -0,0 +1,109 @@
+import json
+import os
+
+import numpy as np
+
+from .engine import BitPackedEngine, ScrollEngine
+from .model import ConwaysGameOfLife, ENGINE_CLASSES
+
+FORMAT_VERSION = 1
+
+
+def save_checkpoint(model, path):
+    """Write the full state of ``model`` to the folder ``path``.
+
+    ``meta.json`` holds the model parameters, the step counter, the cycle
+    detection state (the remembered generation hashes, in order) and the
+    state of both random number generators. The grid is a single .npy
+    file: ``cells.npy`` with the (width, height) states for the "agents"
+    and "numpy" engines, ``rows.npy`` with the ring buffer for "scroll"
+    and with the packed bytes of every row for "bitpacked".
+    """
+    os.makedirs(path, exist_ok=True)
+
+    if model.engine is None:
+        engine = "agents"
+    else:
+        engine = next(name for name, cls in ENGINE_CLASSES.items() if isinstance(model.engine, cls))
+
+    meta = {
+        "version": FORMAT_VERSION,
+        "params": {
+            "width": model.width,
+            "height": model.height,
+            "seed": model._seed,
+            "rule": model.rule,
+            "engine": engine,
+            "cycle_history": model.cycle_history,
+            "full_sweep_fraction": model.full_sweep_fraction,
+        },
+        "steps": model.steps,
+        "running": model.running,
+        "cycle_length": model.cycle_length,
+        "transient_length": model.transient_length,
+        "seen": [[key.hex(), step] for key, step in model._seen.items()],
+        "generation": getattr(model.engine, "generation", None),
+        "random": model.random.getstate(),
+        "rng": model.rng.bit_generator.state,
+    }
+    with open(os.path.join(path, "meta.json"), "w") as file:
+        json.dump(meta, file)
+
+    if isinstance(model.engine, ScrollEngine):
+        np.save(os.path.join(path, "rows.npy"), model.engine.rows)
+    elif isinstance(model.engine, BitPackedEngine):
+        row_bytes = (model.width + 7) // 8
+        packed = np.frombuffer(model.engine.fingerprint(), dtype=np.uint8)
+        np.save(os.path.join(path, "rows.npy"), packed.reshape(model.height, row_bytes))
+    else:
+        np.save(os.path.join(path, "cells.npy"), model.get_state_array())
+
+
+def load_checkpoint(path, profile=False, trace_allocations=False):
+    """Rebuild the model saved in the folder ``path`` by save_checkpoint.
+
+    The arrays are memory-mapped copy-on-write, so a large grid is not
+    read up front and the files are never changed by the resumed model.
+    Stepping the resumed model gives the same generations, and stops on
+    the same cycle, as the model that was saved.
+    """
+    with open(os.path.join(path, "meta.json")) as file:
+        meta = json.load(file)
+    if meta["version"] != FORMAT_VERSION:
+        raise ValueError(f"Unsupported checkpoint version {meta['version']}, expected {FORMAT_VERSION}")
+
+    model = ConwaysGameOfLife(
+        initial_fraction_alive=0.0,
+        profile=profile,
+        trace_allocations=trace_allocations,
+        **meta["params"],
+    )
+
+    def load(name):
+        return np.load(os.path.join(path, f"{name}.npy"), mmap_mode="c")
+
+    if isinstance(model.engine, ScrollEngine):
+        model.engine.rows = load("rows")
+        model.engine.generation = meta["generation"]
+    elif isinstance(model.engine, BitPackedEngine):
+        model.engine.rows = [int.from_bytes(row.tobytes(), "little") for row in load("rows")]
+    elif model.engine is not None:
+        model.engine.cells = load("cells")
+    else:
+        cells = load("cells")
+        for cell in model.agents:
+            cell.state = int(cells[cell.pos])
+        model._cells = cells
+        model._active = None # La primera generación reanudada evalúa todas las celdas
+
+    model.steps = meta["steps"]
+    model.running = meta["running"]
+    model.cycle_length = meta["cycle_length"]
+    model.transient_length = meta["transient_length"]
+    model._seen = {bytes.fromhex(key): step for key, step in meta["seen"]}
+
+    version, internal_state, gauss = meta["random"]
+    model.random.setstate((version, tuple(internal_state), gauss))
+    model.rng.bit_generator.state = meta["rng"]
+
+    return model
@@ -0,0 +1,101 @@
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import pandas as pd
+
+
+class StepProfiler:
+    """Records the wall time of each phase of every model step.
+
+    One record is kept per step with the seconds spent in each phase, the
+    number of cells evaluated and, when ``trace_allocations`` is set, the
+    bytes allocated during the step (from two tracemalloc snapshots) and
+    the peak traced memory.
+
+    If tracemalloc is not already running, the profiler only traces while
+    a step is recorded and stops it again at the end of the step, so
+    tracing never slows down the rest of the process.
+    """
+
+    def __init__(self, trace_allocations=False):
+        self.trace_allocations = trace_allocations
+        self.records = []
+        self._current = None
+        self._snapshot = None
+        self._owns_tracing = False
+
+    def start_step(self, step):
+        """Open the record of a new step."""
+        self._current = {"step": step}
+        if self.trace_allocations:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._owns_tracing = True
+            tracemalloc.reset_peak()
+            self._snapshot = tracemalloc.take_snapshot()
+
+    @contextmanager
+    def phase(self, name):
+        """Add the time spent inside the block to ``name`` in the current step.
+
+        Outside a step (for example while rendering) the time goes to the
+        last recorded step.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            record = self._current if self._current is not None else (
+                self.records[-1] if self.records else None
+            )
+            if record is not None:
+                record[name] = record.get(name, 0.0) + elapsed
+
+    def end_step(self, cells_evaluated):
+        """Close the record of the current step."""
+        record = self._current
+        record["cells_evaluated"] = cells_evaluated
+
+        if self.trace_allocations:
+            snapshot = tracemalloc.take_snapshot()
+            differences = snapshot.compare_to(self._snapshot, "filename")
+            record["allocated_bytes"] = sum(d.size_diff for d in differences if d.size_diff > 0)
+            record["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+            self._snapshot = None
+            if self._owns_tracing:
+                tracemalloc.stop()
+                self._owns_tracing = False
+
+        self.records.append(record)
+        self._current = None
+
+    def get_table(self):
+        """Return one row per step, indexed by step, like a DataCollector table."""
+        return pd.DataFrame(self.records).set_index("step").fillna(0.0)
+
+    def summary(self):
+        """Return a text report with the time spent in each phase."""
+        if not self.records:
+            return "No steps recorded."
+
+        table = self.get_table()
+        phases = [
+            column for column in table.columns
+            if column not in ("cells_evaluated", "allocated_bytes", "peak_bytes")
+        ]
+        total = table[phases].to_numpy().sum()
+
+        lines = [f"{len(table)} steps, {total:.3f} s in total"]
+        for phase in phases:
+            seconds = table[phase].sum()
+            share = seconds / total * 100 if total else 0.0
+            lines.append(
+                f"  {phase:<16} {seconds:9.3f} s  {seconds / len(table) * 1000:9.2f} ms/step  {share:5.1f}%"
+            )
+        lines.append(f"  cells evaluated  {table['cells_evaluated'].mean():,.0f} per step")
+        if self.trace_allocations:
+            lines.append(f"  allocated        {table['allocated_bytes'].mean():,.0f} bytes per step")
+            lines.append(f"  peak traced      {table['peak_bytes'].max():,.0f} bytes")
+        return "\n".join(lines)
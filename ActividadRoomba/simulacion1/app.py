@@ -4,9 +4,9 @@ Date: 19-11-2025
 """
 
 from mesa.visualization import Slider, SolaraViz, make_space_component, make_plot_component
-from mesa.visualization.components import AgentPortrayalStyle
-from simulacion.model import RoombaModel
-from simulacion.agent import Roomba, Obstacle, Dirt, ChargingStation
+from mesa.visualization.components import AgentPortrayalStyle, PropertyLayerStyle
+from simulacion.model import RoombaModel, EXPLORATION_STRATEGIES
+from simulacion.agent import Roomba, Obstacle, ChargingStation
 
 def agent_portrayal(agent):
     """
@@ -30,11 +30,6 @@ def agent_portrayal(agent):
         portrayal.size = 80
         portrayal.marker = "o"
         
-    elif isinstance(agent, Dirt):
-        portrayal.color = "tab:brown"
-        portrayal.size = 40
-        portrayal.marker = "s"
-
     elif isinstance(agent, Obstacle):
         portrayal.color = "black"
         portrayal.size = 90
@@ -47,17 +42,38 @@ def agent_portrayal(agent):
 
     return portrayal
 
+def propertylayer_portrayal(layer):
+    """
+    Dirt is a property layer of the grid, not agents: it is drawn as a
+    brown overlay. Obstacles and stations are drawn as agents.
+    """
+    if layer.name == "dirt":
+        return PropertyLayerStyle(color="tab:brown", alpha=0.8, vmax=1, colorbar=False)
+    return None
+
 model_params = {
+    "seed": {
+        "type": "InputText",
+        "value": 42,
+        "label": "Random Seed",
+    },
     "numAgents": Slider("Number of Agents", 1, 1, 5, 1),
     "width": Slider("Grid Width", 10, 5, 20, 1),
     "height": Slider("Grid Height", 10, 5, 20, 1),
     "dirtPercentage": Slider("Dirt Percentage", 0.3, 0.0, 1.0, 0.05),
     "obstaclePercentage": Slider("Obstacle Percentage", 0.2, 0.0, 1.0, 0.05),
     "maxTime": Slider("Max Time Steps", 1000, 100, 5000, 100),
+    "exploration": {
+        "type": "Select",
+        "value": "random",
+        "label": "Exploration",
+        "values": list(EXPLORATION_STRATEGIES),
+    },
 }
 
 space_component = make_space_component(
     agent_portrayal,
+    propertylayer_portrayal=propertylayer_portrayal,
     post_process=lambda ax: ax.set_aspect("equal"),
     draw_grid=True
 )
@@ -70,18 +86,21 @@ plot_component = make_plot_component(
     }
 )
 
+efficiency_component = make_plot_component({"CoverageEfficiency": "tab:purple"})
+
 initial_model = RoombaModel(
     width=10,
     height=10,
     numAgents=1,
     dirtPercentage=0.3,
     obstaclePercentage=0.2,
-    maxTime=1000
+    maxTime=1000,
+    seed=42
 )
 
 page = SolaraViz(
     initial_model,
-    components=[space_component, plot_component],
+    components=[space_component, plot_component, efficiency_component],
     model_params=model_params,
     name="Roomba Simulation 1 (Single Agent)"
 )
\ No newline at end of file
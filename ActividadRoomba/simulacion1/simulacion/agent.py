@@ -4,8 +4,10 @@ Date: 19-11-2025
 Description: Agent definitions for the Roomba simulation.
 """
 
+from collections import deque
+
 from mesa.discrete_space import CellAgent, FixedAgent
-import heapq
+from .pathfinding import findPath, findNearest
 
 class Obstacle(FixedAgent):
     """
@@ -21,6 +23,7 @@ class Obstacle(FixedAgent):
         """
         super().__init__(model)
         self.cell = cell
+        model.obstacleCount += 1
 
     def step(self):
         """
@@ -28,26 +31,6 @@ class Obstacle(FixedAgent):
         """
         pass
 
-class Dirt(FixedAgent):
-    """
-    Agent representing dirt or trash in a cell.
-    """
-    def __init__(self, model, cell):
-        """
-        Initializes the dirt.
-        Args:
-            model: Reference to the simulation model.
-            cell: The cell where the dirt is located.
-        """
-        super().__init__(model)
-        self.cell = cell
-
-    def step(self):
-        """
-        Dirt is static until cleaned.
-        """
-        pass
-
 class ChargingStation(FixedAgent):
     """
     Agent representing a charging station.
@@ -76,7 +59,7 @@ class Roomba(CellAgent):
     1. Charge battery (if low and at station).
     2. Return to station (if battery is low).
     3. Clean (if the current cell is dirty).
-    4. Explore (move randomly).
+    4. Explore (random walk or nearest unexplored cell).
     """
     def __init__(self, model, cell):
         """
@@ -90,13 +73,21 @@ class Roomba(CellAgent):
         self.batteryLevel = 100
         self.batteryThreshold = 20
 
+        # Cached path plan: remaining cells and where the agent must be to use it
+        self.plannedPath = deque()
+        self.planCell = None
+
+        # Explored cells never become unexplored again, so once no
+        # unexplored cell is reachable the search is not repeated
+        self.exploredAll = False
+
     def step(self):
         """
         Executes one step of the agent's behavior using subsumption architecture.
         Priorities:
         1. Survival (Charging/Going to Station)
         2. Work (Cleaning)
-        3. Exploration (Random movement)
+        3. Exploration (model's exploration strategy)
         """
         # Priority 1: Survival - Check if charging is needed
         if self.batteryLevel < 100 and self.isAtChargingStation():
@@ -108,9 +99,9 @@ class Roomba(CellAgent):
         elif self.isCellDirty():
             self.cleanCell()
         
-        # Priority 3: Exploration - Move randomly if no other priority is active
+        # Priority 3: Exploration - Look for dirt if no other priority is active
         else:
-            self.moveRandomly()
+            self.explore()
 
     def isAtChargingStation(self):
         """
@@ -118,12 +109,7 @@ class Roomba(CellAgent):
         Returns:
             True if at a station, False otherwise.
         """
-        agentsInCell = self.cell.agents
-        isAtStation = False
-        for agent in agentsInCell:
-            if isinstance(agent, ChargingStation):
-                isAtStation = True
-        return isAtStation
+        return bool(self.model.stationMap[self.cell.coordinate])
 
     def chargeBattery(self):
         """
@@ -136,133 +122,132 @@ class Roomba(CellAgent):
 
     def isCellDirty(self):
         """
-        Checks if the current cell contains a Dirt agent.
+        Checks the model's dirt layer at the current cell.
         Returns:
             True if dirt is present, False otherwise.
         """
-        agentsInCell = self.cell.agents
-        hasDirt = False
-        for agent in agentsInCell:
-            if isinstance(agent, Dirt):
-                hasDirt = True
-        return hasDirt
+        return bool(self.model.dirtMap[self.cell.coordinate])
 
     def cleanCell(self):
         """
         Cleans the dirt in the current cell.
         Consumes 1% battery.
         """
-        agentsInCell = self.cell.agents
-        dirtAgent = None
-        for agent in agentsInCell:
-            if isinstance(agent, Dirt) and dirtAgent is None:
-                dirtAgent = agent
-        
-        if dirtAgent is not None:
-            dirtAgent.remove() 
+        if self.isCellDirty():
+            self.model.dirtMap[self.cell.coordinate] = False
+            self.model.dirtCount -= 1
             self.batteryLevel -= 1
+            self.model.cleanedCount += 1
+
+    def moveTo(self, nextCell):
+        """
+        Moves the agent to nextCell.
+        Consumes 1% battery.
+        """
+        self.cell = nextCell
+        self.batteryLevel -= 1
+        self.model.moveCount += 1
+
+    def explore(self):
+        """
+        Moves on to look for dirt using the model's exploration strategy.
+        With "frontier" the current cell, already clean, is marked as
+        explored and the agent heads to the nearest unexplored cell; once
+        none is reachable it falls back to moving randomly.
+        """
+        if self.model.exploration == "frontier" and not self.exploredAll:
+            self.model.visitedMap[self.cell.coordinate] = True
+            nextStep = self.nextFrontierStep()
+            self.exploredAll = nextStep is None
+            if nextStep is not None:
+                self.moveTo(nextStep)
+                return
+
+        self.moveRandomly()
 
     def moveRandomly(self):
         """
         Moves the agent to a random accessible neighbor cell.
         Consumes 1% battery.
         """
-        neighbors = self.cell.neighborhood
-        validNeighbors = []
-        
-        for neighbor in neighbors:
-            isObstacle = False
-            for agent in neighbor.agents:
-                if isinstance(agent, Obstacle):
-                    isObstacle = True
-            
-            if not isObstacle:
-                validNeighbors.append(neighbor)
+        validNeighbors = self.model.walkableNeighbors[self.cell]
 
         if len(validNeighbors) > 0:
             nextCell = self.random.choice(validNeighbors)
-            self.cell = nextCell
-            self.batteryLevel -= 1
+            self.moveTo(nextCell)
 
     def moveToNearestStation(self):
         """
-        Uses Dijkstra's algorithm to find the path to the nearest charging station
-        and moves one step towards it.
+        Moves one step towards the nearest charging station, following the
+        model's precomputed distance field or searching a path with the
+        model's pathPlanner.
         Consumes 1% battery.
         """
-        targetCells = []
-        
-        for agent in self.model.agents:
-            if isinstance(agent, ChargingStation):
-                targetCells.append(agent.cell)
-        
-        if len(targetCells) > 0:
-            nextStep = self.dijkstraNextStep(self.cell, targetCells)
-            
-            if nextStep is not None and nextStep != self.cell:
-                self.cell = nextStep
-                self.batteryLevel -= 1
+        if self.model.pathPlanner == "field":
+            nextStep = self.model.stationNextHop.get(self.cell)
+        else:
+            useAStar = self.model.pathPlanner == "astar"
+            nextStep = self.nextPlannedStep(self.model.stationCells, useAStar)
 
-    def dijkstraNextStep(self, startCell, targetCells):
+        if nextStep is not None:
+            self.moveTo(nextStep)
+
+    def nextPlannedStep(self, targetCells, useAStar=False):
         """
-        Implements Dijkstra's algorithm to find the shortest path.
+        Returns the next cell of the cached path to the closest target.
+        A new path is searched (Dijkstra, or A* with useAStar) only when
+        there is no plan, the agent left the planned path, the planned
+        goal is no longer a target or the next cell is blocked; otherwise
+        the rest of the previous plan is followed.
         Args:
-            startCell: The starting cell (Cell object).
             targetCells: A list of possible destination cells (Cell objects).
+            useAStar: Search with A* (Chebyshev heuristic) instead of Dijkstra.
         Returns:
-            The next Cell object in the optimal path.
+            The next Cell object in the path, or None if there is none.
         """
-        priorityQueue = []
-        heapq.heappush(priorityQueue, (0, id(startCell), startCell))
-        
-        cameFrom = {} 
-        costSoFar = {}
-        
-        cameFrom[startCell] = None
-        costSoFar[startCell] = 0
-        
-        closestTarget = None
-        targetFound = False
-        
-        while len(priorityQueue) > 0 and not targetFound:
-            currentTuple = heapq.heappop(priorityQueue)
-            currentCell = currentTuple[2]
-            
-            isTarget = False
-            for target in targetCells:
-                if currentCell == target:
-                    isTarget = True
-            
-            if isTarget:
-                closestTarget = currentCell
-                targetFound = True
-            else:
-                neighbors = currentCell.neighborhood
-                for neighbor in neighbors:
-                    isObstacle = False
-                    for agent in neighbor.agents:
-                        if isinstance(agent, Obstacle):
-                            isObstacle = True
-                    
-                    if not isObstacle:
-                        newCost = costSoFar[currentCell] + 1 
-                        
-                        if neighbor not in costSoFar or newCost < costSoFar[neighbor]:
-                            costSoFar[neighbor] = newCost
-                            priorityQueue.append((newCost, id(neighbor), neighbor))
-                            heapq.heapify(priorityQueue) 
-                            cameFrom[neighbor] = currentCell
-        
+        planIsValid = (
+            len(self.plannedPath) > 0
+            and self.planCell == self.cell
+            and self.plannedPath[-1] in targetCells
+            and self.model.isWalkable(self.plannedPath[0])
+        )
+
+        if not planIsValid:
+            path = findPath(self.cell, targetCells, self.model.walkableNeighbors, useAStar)
+            self.plannedPath = deque(path or [])
+
+        nextStep = None
+        if len(self.plannedPath) > 0:
+            nextStep = self.plannedPath.popleft()
+        self.planCell = nextStep
+        return nextStep
+
+    def nextFrontierStep(self):
+        """
+        Returns the next cell of the cached path to the nearest unexplored
+        cell. Shares the plan cache with nextPlannedStep: a new BFS is run
+        only when there is no plan, the agent left it, its goal has been
+        explored in the meantime or its next cell is blocked.
+        Returns:
+            The next Cell object in the path, or None if there is none.
+        """
+        planIsValid = (
+            len(self.plannedPath) > 0
+            and self.planCell == self.cell
+            and not self.model.isExplored(self.plannedPath[-1])
+            and self.model.isWalkable(self.plannedPath[0])
+        )
+
+        if not planIsValid:
+            path = findNearest(
+                self.cell,
+                lambda cell: not self.model.isExplored(cell),
+                self.model.walkableNeighbors,
+            )
+            self.plannedPath = deque(path or [])
+
         nextStep = None
-        if closestTarget is not None:
-            current = closestTarget
-            isStart = (current == startCell)
-            while not isStart:
-                previous = cameFrom[current]
-                if previous == startCell:
-                    nextStep = current
-                    isStart = True
-                else:
-                    current = previous
-                    
+        if len(self.plannedPath) > 0:
+            nextStep = self.plannedPath.popleft()
+        self.planCell = nextStep
         return nextStep
\ No newline at end of file
@@ -0,0 +1,153 @@
+"""
+Description: Checkpoint and resume for RoombaModel (Simulation 1).
+
+A checkpoint is a folder. meta.json holds the model parameters, the step
+counters and the state of both random number generators (model.random
+and model.rng); every array (obstacle and dirt layers, the known-clean
+map, the Roomba and its cached path) is a .npy file, which
+loadCheckpoint memory-maps instead of parsing.
+
+Stepping a resumed model gives step for step the same run as the model
+that was saved, so a long run can be stopped and picked up again, or
+forked into several what-if continuations (another maxTime, pathPlanner
+or exploration, or a new seed). Data collection starts over at the
+checkpoint step.
+"""
+
+import json
+import os
+
+import numpy as np
+
+from .agent import Obstacle
+from .model import RoombaModel
+
+FORMAT_VERSION = 1
+
+# Parameters a continuation may change; the floor is fixed
+RESUME_OVERRIDES = ("maxTime", "pathPlanner", "exploration", "seed")
+
+# One record per Roomba. planX/planY are -1 for None; the planLength
+# cells of its cached path are in plans.npy.
+ROBOT_DTYPE = np.dtype([
+    ("x", np.int64), ("y", np.int64), ("battery", np.int64), ("exploredAll", bool),
+    ("planX", np.int64), ("planY", np.int64), ("planLength", np.int64),
+])
+
+def saveCheckpoint(model, path):
+    """
+    Writes the full state of model to the folder path (created if
+    needed, existing files are replaced).
+    Args:
+        model: The RoombaModel to save.
+        path: Checkpoint folder.
+    """
+    os.makedirs(path, exist_ok=True)
+
+    meta = {
+        "version": FORMAT_VERSION,
+        "params": {
+            "width": model.grid.width,
+            "height": model.grid.height,
+            "numAgents": model.numAgents,
+            "maxTime": model.maxTime,
+            "pathPlanner": model.pathPlanner,
+            "exploration": model.exploration,
+            "seed": model._seed,
+        },
+        "counters": {
+            "steps": model.steps,
+            "stepCount": model.stepCount,
+            "running": model.running,
+            "dirtCount": model.dirtCount,
+            "moveCount": model.moveCount,
+            "cleanedCount": model.cleanedCount,
+        },
+        "random": model.random.getstate(),
+        "rng": model.rng.bit_generator.state,
+    }
+    with open(os.path.join(path, "meta.json"), "w") as file:
+        json.dump(meta, file)
+
+    roomba = model.roombas[0]
+    robot = np.zeros(1, dtype=ROBOT_DTYPE)
+    robot["x"], robot["y"] = roomba.cell.coordinate
+    robot["battery"] = roomba.batteryLevel
+    robot["exploredAll"] = roomba.exploredAll
+    robot["planX"], robot["planY"] = (-1, -1) if roomba.planCell is None else roomba.planCell.coordinate
+    robot["planLength"] = len(roomba.plannedPath)
+
+    arrays = {
+        "obstacle": model.obstacleMap,
+        "dirt": model.dirtMap,
+        "visited": model.visitedMap,
+        "robots": robot,
+        "plans": np.array([cell.coordinate for cell in roomba.plannedPath], dtype=np.int64).reshape(-1, 2),
+    }
+    for name, array in arrays.items():
+        np.save(os.path.join(path, f"{name}.npy"), array)
+
+def loadCheckpoint(path, **overrides):
+    """
+    Rebuilds the model saved in the folder path.
+    Args:
+        path: Checkpoint folder written by saveCheckpoint.
+        overrides: New values for the parameters in RESUME_OVERRIDES. A
+            new seed starts fresh random number generators instead of the
+            saved ones, so the continuation diverges from the saved run.
+    Returns:
+        RoombaModel: The resumed model.
+    """
+    unknown = sorted(set(overrides) - set(RESUME_OVERRIDES))
+    if unknown:
+        raise ValueError(f"Cannot override {unknown} when resuming, only {RESUME_OVERRIDES}")
+
+    with open(os.path.join(path, "meta.json")) as file:
+        meta = json.load(file)
+    if meta["version"] != FORMAT_VERSION:
+        raise ValueError(f"Unsupported checkpoint version {meta['version']}, expected {FORMAT_VERSION}")
+
+    def load(name):
+        # Copy-on-write: the model may change the arrays, the files stay as saved
+        return np.load(os.path.join(path, f"{name}.npy"), mmap_mode="c")
+
+    # An empty floor (station and Roomba at [0,0]), then filled from the files
+    params = {**meta["params"], **overrides}
+    model = RoombaModel(dirtPercentage=0, obstaclePercentage=0, **params)
+
+    np.copyto(model.obstacleMap, load("obstacle"))
+    np.copyto(model.dirtMap, load("dirt"))
+    model.visitedMap = load("visited")
+
+    for x, y in np.argwhere(model.obstacleMap).tolist():
+        Obstacle(model, model.grid[(x, y)])
+
+    x, y, battery, exploredAll, planX, planY, planLength = load("robots").tolist()[0]
+    roomba = model.roombas[0]
+    roomba.cell = model.grid[(x, y)]
+    roomba.batteryLevel = battery
+    roomba.exploredAll = exploredAll
+    roomba.planCell = None if planX == -1 else model.grid[(planX, planY)]
+    roomba.plannedPath.extend(model.grid[(cellX, cellY)] for cellX, cellY in load("plans").tolist())
+
+    # Obstacles changed, so the walkable neighbors and way home are rebuilt
+    model.buildNavigation()
+
+    counters = meta["counters"]
+    model.steps = counters["steps"]
+    model.stepCount = counters["stepCount"]
+    model.running = counters["running"]
+    model.dirtCount = counters["dirtCount"]
+    model.moveCount = counters["moveCount"]
+    model.cleanedCount = counters["cleanedCount"]
+
+    model.datacollector = model.createDataCollector()
+    model.datacollector.collect(model)
+
+    # Last, so nothing above draws from the restored generators
+    if "seed" not in overrides:
+        version, internalState, gauss = meta["random"]
+        model.random.setstate((version, tuple(internalState), gauss))
+        model.rng.bit_generator.state = meta["rng"]
+
+    return model
@@ -3,70 +3,106 @@ Author: Juan de Dios Gastélum Flores - A01784523
 Date: 19-11-2025
 """
 
+from collections import deque
+
+import numpy as np
 from mesa import Model
+from mesa.agent import AgentSet
 from mesa.datacollection import DataCollector
 from mesa.discrete_space import OrthogonalMooreGrid
-from .agent import Roomba, Obstacle, Dirt, ChargingStation
+from .agent import Roomba, Obstacle, ChargingStation
+
+PATH_PLANNERS = ("field", "dijkstra", "astar")
+EXPLORATION_STRATEGIES = ("random", "frontier")
 
 class RoombaModel(Model):
     """
     Model class for the Roomba simulation (Single Agent).
     """
-    def __init__(self, width, height, numAgents, dirtPercentage, obstaclePercentage, maxTime):
+    def __init__(self, width, height, numAgents, dirtPercentage, obstaclePercentage, maxTime, pathPlanner="field", exploration="random", seed=None):
         """
         Initializes the simulation model.
+        pathPlanner chooses how a low-battery Roomba finds its way home:
+        "field" follows the precomputed station distance field, "dijkstra"
+        and "astar" search a path from its current cell.
+        exploration chooses how a Roomba looks for dirt: "random" walks to a
+        random neighbor, "frontier" heads to the nearest cell not yet left
+        clean by a Roomba.
+        seed makes placement and movement reproducible.
         """
-        super().__init__()
+        if pathPlanner not in PATH_PLANNERS:
+            raise ValueError(f"Unknown pathPlanner {pathPlanner!r}, expected one of {PATH_PLANNERS}")
+        if exploration not in EXPLORATION_STRATEGIES:
+            raise ValueError(
+                f"Unknown exploration {exploration!r}, expected one of {EXPLORATION_STRATEGIES}"
+            )
+
+        super().__init__(seed=seed)
+        self.pathPlanner = pathPlanner
+        self.exploration = exploration
         self.numAgents = numAgents
         self.grid = OrthogonalMooreGrid((width, height), torus=False, random=self.random)
         self.running = True
         self.maxTime = maxTime
         self.stepCount = 0
 
+        # Counters: obstacles count themselves, dirt is counted at placement
+        # and by Roomba.cleanCell
+        self.dirtCount = 0
+        self.obstacleCount = 0
+
+        # Fleet totals kept up to date by the Roombas
+        self.moveCount = 0
+        self.cleanedCount = 0
+
         totalCells = width * height
         numObstacles = int(totalCells * obstaclePercentage)
         numDirt = int(totalCells * dirtPercentage)
 
+        # The start cell is reserved for the station and the Roomba
+        if numObstacles + numDirt > totalCells - 1:
+            raise ValueError(
+                f"Cannot place {numObstacles} obstacles and {numDirt} dirt cells on a "
+                f"{width}x{height} grid: lower obstaclePercentage or dirtPercentage"
+            )
+
+        # Per-cell layers (Mesa property layers), so Roombas never scan
+        # cell.agents: True where an Obstacle, a ChargingStation or dirt is.
+        # Dirt is only a bit here, cleaning a cell clears it.
+        self.obstacleMap = self.grid.create_property_layer("obstacle", False, dtype=bool).data
+        self.stationMap = self.grid.create_property_layer("station", False, dtype=bool).data
+        self.dirtMap = self.grid.create_property_layer("dirt", False, dtype=bool).data
+
+        # Known-clean map shared by the fleet: True where a Roomba found no
+        # dirt left when it set off exploring
+        self.visitedMap = np.zeros((width, height), dtype=bool)
+
         # --- Agent Placement ---
 
         # 1. Place Charging Station at [0,0] (Start Position)
         start_cell = self.grid[(0, 0)]
         
         ChargingStation(self, start_cell)
+        self.stationMap[start_cell.coordinate] = True
 
         # 2. Place Roomba Agent at [0,0]
         Roomba(self, start_cell)
 
-        # 3. Place Obstacles randomly
-        obstaclesPlaced = 0
-        while obstaclesPlaced < numObstacles:
-            x = self.random.randrange(width)
-            y = self.random.randrange(height)
-            cell = self.grid[(x, y)]
+        # 3. Place Obstacles and 4. Dirt on distinct random empty cells
+        freeCells = self.sampleEmptyCells(numObstacles + numDirt)
 
-            if cell.is_empty and cell != start_cell:
-                Obstacle(self, cell)
-                obstaclesPlaced += 1
+        for cell in freeCells[:numObstacles]:
+            Obstacle(self, cell)
+            self.obstacleMap[cell.coordinate] = True
 
-        # 4. Place Dirt randomly
-        dirtPlaced = 0
-        while dirtPlaced < numDirt:
-            x = self.random.randrange(width)
-            y = self.random.randrange(height)
-            cell = self.grid[(x, y)]
+        for cell in freeCells[numObstacles:]:
+            self.dirtMap[cell.coordinate] = True
+        self.dirtCount = numDirt
 
-            if cell.is_empty and cell != start_cell:
-                Dirt(self, cell)
-                dirtPlaced += 1
+        self.buildNavigation()
 
         # --- Data Collection ---
-        self.datacollector = DataCollector(
-            model_reporters={
-                "CleanPercentage": self.getCleanPercentage,
-                "DirtyCells": lambda m: m.countDirt(),
-                "TotalMoves": lambda m: m.stepCount
-            }
-        )
+        self.datacollector = self.createDataCollector()
         
         # Collect initial state
         self.datacollector.collect(self)
@@ -77,28 +113,109 @@ class RoombaModel(Model):
         """
         self.stepCount += 1
         
-        self.agents.shuffle_do("step")
+        self.roombas.shuffle_do("step")
         
         self.datacollector.collect(self)
 
         if self.countDirt() == 0 or self.stepCount >= self.maxTime:
             self.running = False
 
+    def buildNavigation(self):
+        """
+        Precomputes, from the placed obstacles and stations, the walkable
+        neighbors of every cell and the station distance field, and
+        collects the Roombas to schedule.
+        """
+        # --- Walkable Neighbors ---
+        # Obstacles never move, so each cell's enterable neighbors are listed
+        # once (in neighborhood order) for movement and pathfinding.
+        self.walkableNeighbors = {
+            cell: [neighbor for neighbor in cell.neighborhood if self.isWalkable(neighbor)]
+            for cell in self.grid.all_cells
+        }
+
+        # --- Station Distance Field ---
+        # Stations and obstacles never move, so the way home from every cell
+        # is computed once here instead of on every homing step.
+        self.stationCells = [
+            agent.cell for agent in self.agents if isinstance(agent, ChargingStation)
+        ]
+        self.stationDistance, self.stationNextHop = self.buildStationField()
+
+        # --- Schedule ---
+        # Only Roombas act; stepping the static agents would do nothing
+        self.roombas = AgentSet(
+            [agent for agent in self.agents if isinstance(agent, Roomba)], random=self.random
+        )
+
+    def createDataCollector(self):
+        """
+        Creates the DataCollector with the model reporters.
+        """
+        return DataCollector(
+            model_reporters={
+                "CleanPercentage": self.getCleanPercentage,
+                "CoverageEfficiency": self.getCoverageEfficiency,
+                "DirtyCells": lambda m: m.countDirt(),
+                "TotalMoves": lambda m: m.stepCount
+            }
+        )
+
+    def sampleEmptyCells(self, count):
+        """
+        Picks count distinct random cells that hold no agent, in one pass
+        over the grid instead of retrying random coordinates.
+        Args:
+            count: Number of cells to pick.
+        Returns:
+            A list of count cells in random order.
+        """
+        emptyCells = [cell for cell in self.grid.all_cells if cell.is_empty]
+        if count > len(emptyCells):
+            raise ValueError(f"Cannot pick {count} empty cells, only {len(emptyCells)} are left")
+        return self.random.sample(emptyCells, count)
+
+    def buildStationField(self):
+        """
+        Runs one multi-source BFS from every ChargingStation over the cells
+        that are not obstacles.
+        Returns:
+            stationDistance: dict Cell -> steps to the nearest station.
+            stationNextHop: dict Cell -> neighbor Cell one step closer to it.
+        """
+        stationDistance = {}
+        stationNextHop = {}
+        queue = deque()
+
+        for stationCell in self.stationCells:
+            stationDistance[stationCell] = 0
+            queue.append(stationCell)
+
+        while len(queue) > 0:
+            currentCell = queue.popleft()
+            for neighbor in self.walkableNeighbors[currentCell]:
+                if neighbor not in stationDistance:
+                    stationDistance[neighbor] = stationDistance[currentCell] + 1
+                    stationNextHop[neighbor] = currentCell
+                    queue.append(neighbor)
+
+        return stationDistance, stationNextHop
+
+    def isWalkable(self, cell):
+        """Checks the occupancy bitmap: True if the cell has no Obstacle."""
+        return not self.obstacleMap[cell.coordinate]
+
     def countDirt(self):
-        """Counts Dirt agents currently in the model."""
-        count = 0
-        for agent in self.agents:
-            if isinstance(agent, Dirt):
-                count += 1
-        return count
+        """Number of dirty cells left."""
+        return self.dirtCount
+
+    def isExplored(self, cell):
+        """Checks the known-clean map: True if a Roomba has left the cell clean."""
+        return self.visitedMap[cell.coordinate]
 
     def countObstacles(self):
-        """Counts Obstacle agents currently in the model."""
-        count = 0
-        for agent in self.agents:
-            if isinstance(agent, Obstacle):
-                count += 1
-        return count
+        """Number of Obstacle agents in the model."""
+        return self.obstacleCount
 
     @staticmethod
     def getCleanPercentage(model):
@@ -115,4 +232,14 @@ class RoombaModel(Model):
             cleanCells = cleanableCells - dirt
             return (cleanCells / cleanableCells) * 100
         else:
-            return 100.0
\ No newline at end of file
+            return 100.0
+
+    @staticmethod
+    def getCoverageEfficiency(model):
+        """
+        Moves the fleet made per cell it cleaned (lower is better).
+        Returns 0 until the first cell is cleaned.
+        """
+        if model.cleanedCount == 0:
+            return 0.0
+        return model.moveCount / model.cleanedCount
\ No newline at end of file
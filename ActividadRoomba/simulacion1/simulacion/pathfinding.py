@@ -0,0 +1,118 @@
+"""
+Description: Shortest-path search over the Moore grid shared by the Roomba
+simulations (Dijkstra and A*, and a BFS for the nearest matching cell).
+"""
+
+import heapq
+from collections import deque
+from itertools import count
+
+def chebyshevDistance(cellA, cellB):
+    """
+    Number of king moves between two cells, ignoring obstacles.
+    It never overestimates the real cost on a Moore grid, so it is an
+    admissible A* heuristic.
+    """
+    (xA, yA) = cellA.coordinate
+    (xB, yB) = cellB.coordinate
+    return max(abs(xA - xB), abs(yA - yB))
+
+def findPath(startCell, targetCells, walkableNeighbors, useAStar=False, maxCost=None):
+    """
+    Finds a shortest path from startCell to the closest of targetCells.
+    Every move costs 1.
+    Args:
+        startCell: The starting Cell.
+        targetCells: Iterable of destination Cells; the closest one is used.
+        walkableNeighbors: Mapping Cell -> neighbor Cells that can be entered.
+        useAStar: Use A* with the Chebyshev distance to the closest target
+            as heuristic instead of plain Dijkstra.
+        maxCost: Optional limit; paths longer than this are not explored.
+    Returns:
+        List of Cells from the first step to the reached target (empty if
+        startCell is already a target), or None if no target is reachable.
+    """
+    targets = set(targetCells)
+    if len(targets) == 0:
+        return None
+
+    def heuristic(cell):
+        if not useAStar:
+            return 0
+        return min(chebyshevDistance(cell, target) for target in targets)
+
+    # The counter breaks ties in insertion order, so results do not depend
+    # on memory addresses.
+    tieBreaker = count()
+    priorityQueue = [(heuristic(startCell), next(tieBreaker), startCell)]
+    cameFrom = {startCell: None}
+    costSoFar = {startCell: 0}
+    closed = set()
+
+    while len(priorityQueue) > 0:
+        currentCell = heapq.heappop(priorityQueue)[2]
+        if currentCell in closed:
+            continue
+        closed.add(currentCell)
+
+        if currentCell in targets:
+            path = []
+            while currentCell != startCell:
+                path.append(currentCell)
+                currentCell = cameFrom[currentCell]
+            path.reverse()
+            return path
+
+        newCost = costSoFar[currentCell] + 1
+        if maxCost is not None and newCost > maxCost:
+            continue
+
+        for neighbor in walkableNeighbors[currentCell]:
+            if neighbor in closed:
+                continue
+
+            if neighbor not in costSoFar or newCost < costSoFar[neighbor]:
+                costSoFar[neighbor] = newCost
+                cameFrom[neighbor] = currentCell
+                heapq.heappush(priorityQueue, (newCost + heuristic(neighbor), next(tieBreaker), neighbor))
+
+    return None
+
+
+def findNearest(startCell, isTarget, walkableNeighbors):
+    """
+    Breadth-first search for the closest cell accepted by isTarget. Every
+    move costs 1, so the first target reached is a nearest one; use it
+    when the targets are too many to list, like every unexplored cell.
+    Args:
+        startCell: The starting Cell.
+        isTarget: Function Cell -> bool.
+        walkableNeighbors: Mapping Cell -> neighbor Cells that can be entered.
+    Returns:
+        List of Cells from the first step to the reached target (empty if
+        startCell is already a target), or None if no target is reachable.
+    """
+    if isTarget(startCell):
+        return []
+
+    cameFrom = {startCell: None}
+    queue = deque([startCell])
+
+    while len(queue) > 0:
+        currentCell = queue.popleft()
+        for neighbor in walkableNeighbors[currentCell]:
+            if neighbor in cameFrom:
+                continue
+            cameFrom[neighbor] = currentCell
+
+            if isTarget(neighbor):
+                path = []
+                while neighbor != startCell:
+                    path.append(neighbor)
+                    neighbor = cameFrom[neighbor]
+                path.reverse()
+                return path
+
+            queue.append(neighbor)
+
+    return None
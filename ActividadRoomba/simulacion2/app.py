@@ -5,9 +5,9 @@ Description: Visualization server configuration for Simulation 2 (Multi-Agent).
 """
 
 from mesa.visualization import Slider, SolaraViz, make_space_component, make_plot_component
-from mesa.visualization.components import AgentPortrayalStyle
-from simulacion.model import RoombaModel
-from simulacion.agent import Roomba, Obstacle, Dirt, ChargingStation
+from mesa.visualization.components import AgentPortrayalStyle, PropertyLayerStyle
+from simulacion.model import RoombaModel, EXPLORATION_STRATEGIES
+from simulacion.agent import Roomba, Obstacle, ChargingStation
 
 
 def agent_portrayal(agent):
@@ -28,11 +28,6 @@ def agent_portrayal(agent):
         portrayal.size = 70
         portrayal.marker = "o"
 
-    elif isinstance(agent, Dirt):
-        portrayal.color = "tab:brown"
-        portrayal.size = 40
-        portrayal.marker = "s"
-
     elif isinstance(agent, Obstacle):
         portrayal.color = "black"
         portrayal.size = 100
@@ -46,17 +41,38 @@ def agent_portrayal(agent):
     return portrayal
 
 
+def propertylayer_portrayal(layer):
+    """
+    Draws the dirt layer as a brown overlay; the other layers are skipped.
+    """
+    if layer.name == "dirt":
+        return PropertyLayerStyle(color="tab:brown", alpha=0.8, vmax=1, colorbar=False)
+    return None
+
+
 model_params = {
+    "seed": {
+        "type": "InputText",
+        "value": 42,
+        "label": "Random Seed",
+    },
     "numAgents": Slider("Number of Agents", 5, 1, 20, 1),
     "width": Slider("Grid Width", 15, 5, 30, 1),
     "height": Slider("Grid Height", 15, 5, 30, 1),
     "dirtPercentage": Slider("Dirt Percentage", 0.3, 0.0, 1.0, 0.05),
     "obstaclePercentage": Slider("Obstacle Percentage", 0.2, 0.0, 1.0, 0.05),
     "maxTime": Slider("Max Time Steps", 1000, 100, 5000, 100),
+    "exploration": {
+        "type": "Select",
+        "value": "random",
+        "label": "Exploration",
+        "values": list(EXPLORATION_STRATEGIES),
+    },
 }
 
 space_component = make_space_component(
     agent_portrayal,
+    propertylayer_portrayal=propertylayer_portrayal,
     post_process=lambda ax: ax.set_aspect("equal"),
     draw_grid=True
 )
@@ -69,18 +85,21 @@ plot_component = make_plot_component(
     }
 )
 
+efficiency_component = make_plot_component({"CoverageEfficiency": "tab:purple"})
+
 initial_model = RoombaModel(
     width=15,
     height=15,
     numAgents=5,
     dirtPercentage=0.3,
     obstaclePercentage=0.2,
-    maxTime=1000
+    maxTime=1000,
+    seed=42
 )
 
 page = SolaraViz(
     initial_model,
-    components=[space_component, plot_component],
+    components=[space_component, plot_component, efficiency_component],
     model_params=model_params,
     name="Roomba Simulation 2 (Multi-Agent)"
 )
\ No newline at end of file
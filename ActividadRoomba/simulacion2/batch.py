@@ -0,0 +1,169 @@
+"""
+Description: Headless Monte Carlo runs of RoombaModel on a process pool.
+
+Every combination of grid size, number of agents, dirt percentage,
+obstacle percentage and seed is run in a worker process until the floor
+is clean or maxTime is reached. Each run is reduced to one CSV row that
+is appended as soon as it finishes; when the output file already exists,
+the runs it contains are skipped, so an interrupted sweep can be resumed
+by running the same command again.
+
+Example, from this folder:
+    python batch.py --size 15 30 --agents 1 5 10 20 --dirt 0.3 0.6 \
+        --obstacles 0.1 --runs 50 --workers 8 --output fleet.csv
+"""
+
+import argparse
+import csv
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from simulacion.model import RoombaModel, PATH_PLANNERS, EXPLORATION_STRATEGIES, ENGINES
+from simulacion.agent import Roomba
+
+# Swept parameters, in the order itertools.product yields them
+SWEEP_COLUMNS = ["size", "numAgents", "dirtPercentage", "obstaclePercentage", "seed"]
+# Every model parameter, so runs with other settings are neither skipped
+# nor mixed up with these ones
+KEY_COLUMNS = SWEEP_COLUMNS + ["maxTime", "pathPlanner", "exploration", "engine"]
+COLUMNS = KEY_COLUMNS + [
+    "steps",
+    "cleanTime",
+    "cleanPercentage",
+    "totalMoves",
+    "cleanedPerRobot",
+    "runSeconds",
+]
+
+def runKey(row):
+    """
+    Identifies a run by its parameters, as read back from the CSV file.
+    """
+    return tuple(str(row[column]) for column in KEY_COLUMNS)
+
+def runOne(size, numAgents, dirtPercentage, obstaclePercentage, seed, maxTime, pathPlanner="field",
+           exploration="random", engine="agents"):
+    """
+    Runs a single model and reduces it to its summary statistics.
+    cleanTime is the step at which the floor reached 100% clean, or empty
+    if it did not within maxTime.
+    """
+    start = time.perf_counter()
+    model = RoombaModel(
+        width=size,
+        height=size,
+        numAgents=numAgents,
+        dirtPercentage=dirtPercentage,
+        obstaclePercentage=obstaclePercentage,
+        maxTime=maxTime,
+        pathPlanner=pathPlanner,
+        exploration=exploration,
+        engine=engine,
+        seed=seed,
+    )
+
+    while model.running:
+        model.step()
+
+    if model.engine is not None:
+        cleanedPerRobot = model.engine.cleanedCells.tolist()
+    else:
+        cleanedPerRobot = [agent.cleaned_cells for agent in model.agents if isinstance(agent, Roomba)]
+
+    return {
+        "size": size,
+        "numAgents": numAgents,
+        "dirtPercentage": dirtPercentage,
+        "obstaclePercentage": obstaclePercentage,
+        "seed": seed,
+        "maxTime": maxTime,
+        "pathPlanner": pathPlanner,
+        "exploration": exploration,
+        "engine": engine,
+        "steps": model.stepCount,
+        "cleanTime": model.stepCount if model.countDirt() == 0 else "",
+        "cleanPercentage": RoombaModel.getCleanPercentage(model),
+        "totalMoves": model.moveCount,
+        "cleanedPerRobot": ";".join(str(cleaned) for cleaned in cleanedPerRobot),
+        "runSeconds": time.perf_counter() - start,
+    }
+
+def completedRuns(output):
+    """
+    Keys of the runs already written to the output file.
+    """
+    if not os.path.exists(output):
+        return set()
+    with open(output, newline="") as file:
+        reader = csv.DictReader(file)
+        if reader.fieldnames is not None and reader.fieldnames != COLUMNS:
+            raise ValueError(f"{output} has columns {reader.fieldnames}, expected {COLUMNS}: use another --output")
+        return {runKey(row) for row in reader}
+
+def sweep(sizes, agents, dirtPercentages, obstaclePercentages, seeds, maxTime, output,
+          pathPlanner="field", exploration="random", engine="agents", workers=None):
+    """
+    Runs every parameter combination not yet in output and appends one row
+    per run. Returns the number of runs executed.
+    """
+    done = completedRuns(output)
+    settings = {"maxTime": maxTime, "pathPlanner": pathPlanner, "exploration": exploration, "engine": engine}
+    pending = [
+        params
+        for params in itertools.product(sizes, agents, dirtPercentages, obstaclePercentages, seeds)
+        if runKey({**dict(zip(SWEEP_COLUMNS, params)), **settings}) not in done
+    ]
+    print(f"{len(done)} runs already in {output}, {len(pending)} to go")
+
+    newFile = len(done) == 0 and (not os.path.exists(output) or os.path.getsize(output) == 0)
+    with open(output, "a", newline="") as file, ProcessPoolExecutor(max_workers=workers) as pool:
+        writer = csv.DictWriter(file, fieldnames=COLUMNS)
+        if newFile:
+            writer.writeheader()
+
+        futures = [pool.submit(runOne, *params, maxTime, pathPlanner, exploration, engine) for params in pending]
+        for finished, future in enumerate(as_completed(futures), start=1):
+            writer.writerow(future.result())
+            file.flush()
+            print(f"{finished}/{len(futures)} runs done", end="\r", flush=True)
+
+    print()
+    return len(pending)
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless Monte Carlo runs of RoombaModel.")
+    parser.add_argument("--size", type=int, nargs="+", default=[15], help="grid width and height")
+    parser.add_argument("--agents", type=int, nargs="+", default=[5])
+    parser.add_argument("--dirt", type=float, nargs="+", default=[0.3])
+    parser.add_argument("--obstacles", type=float, nargs="+", default=[0.2])
+    parser.add_argument("--seeds", type=int, nargs="+", default=[0])
+    parser.add_argument("--runs", type=int, default=None,
+                        help="use seeds 0..runs-1 instead of --seeds")
+    parser.add_argument("--max-time", type=int, default=5000)
+    parser.add_argument("--planner", choices=PATH_PLANNERS, default="field")
+    parser.add_argument("--exploration", choices=EXPLORATION_STRATEGIES, default="random")
+    parser.add_argument("--engine", choices=ENGINES, default="agents")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: one per CPU)")
+    parser.add_argument("--output", default="fleet.csv")
+    args = parser.parse_args()
+
+    seeds = list(range(args.runs)) if args.runs is not None else args.seeds
+    sweep(
+        args.size,
+        args.agents,
+        args.dirt,
+        args.obstacles,
+        seeds,
+        args.max_time,
+        args.output,
+        pathPlanner=args.planner,
+        exploration=args.exploration,
+        engine=args.engine,
+        workers=args.workers,
+    )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Description: Micro-benchmark of the shortest-path search used by the Roombas.
+Compares the previous Dijkstra (heapify after every push, linear target
+check) against simulacion.pathfinding's Dijkstra and A* on random maps.
+
+Run from this folder: python benchmark.py [--size 200] [--obstacles 0.3] [--queries 20]
+"""
+
+import argparse
+import heapq
+import random
+import time
+
+from mesa.discrete_space import OrthogonalMooreGrid
+from simulacion.pathfinding import findPath
+
+def legacyDijkstraPath(startCell, targetCells, isWalkable):
+    """
+    Previous Roomba.dijkstraNextStep search, returning the path length.
+    """
+    priorityQueue = []
+    heapq.heappush(priorityQueue, (0, id(startCell), startCell))
+    cameFrom = {startCell: None}
+    costSoFar = {startCell: 0}
+
+    while len(priorityQueue) > 0:
+        currentCell = heapq.heappop(priorityQueue)[2]
+
+        isTarget = False
+        for target in targetCells:
+            if currentCell == target:
+                isTarget = True
+        if isTarget:
+            return costSoFar[currentCell]
+
+        for neighbor in currentCell.neighborhood:
+            if isWalkable(neighbor):
+                newCost = costSoFar[currentCell] + 1
+                if neighbor not in costSoFar or newCost < costSoFar[neighbor]:
+                    costSoFar[neighbor] = newCost
+                    priorityQueue.append((newCost, id(neighbor), neighbor))
+                    heapq.heapify(priorityQueue)
+                    cameFrom[neighbor] = currentCell
+    return None
+
+def pathLength(path):
+    """
+    Number of moves of a findPath result (None if unreachable).
+    """
+    if path is None:
+        return None
+    return len(path)
+
+def buildMap(size, obstaclePercentage, seed):
+    """
+    Builds a size x size grid and the set of obstacle cells.
+    """
+    rng = random.Random(seed)
+    grid = OrthogonalMooreGrid((size, size), torus=False, random=rng)
+    cells = list(grid.all_cells)
+    obstacles = set(rng.sample(cells, int(len(cells) * obstaclePercentage)))
+    free = [cell for cell in cells if cell not in obstacles]
+    return grid, obstacles, free, rng
+
+def main():
+    parser = argparse.ArgumentParser(description="Roomba path search micro-benchmark.")
+    parser.add_argument("--size", type=int, default=200)
+    parser.add_argument("--obstacles", type=float, default=0.3)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    grid, obstacles, free, rng = buildMap(args.size, args.obstacles, args.seed)
+    queries = [(rng.choice(free), rng.sample(free, 3)) for _ in range(args.queries)]
+
+    def isWalkable(cell):
+        return cell not in obstacles
+
+    walkableNeighbors = {
+        cell: [neighbor for neighbor in cell.neighborhood if isWalkable(neighbor)]
+        for cell in grid.all_cells
+    }
+
+    variants = {
+        "legacy dijkstra": lambda start, targets: legacyDijkstraPath(start, targets, isWalkable),
+        "dijkstra": lambda start, targets: pathLength(findPath(start, targets, walkableNeighbors)),
+        "astar": lambda start, targets: pathLength(findPath(start, targets, walkableNeighbors, useAStar=True)),
+    }
+
+    print(f"{args.size}x{args.size} map, {args.obstacles:.0%} obstacles, {args.queries} queries to 3 targets")
+    lengths = {}
+    for name, search in variants.items():
+        start = time.perf_counter()
+        lengths[name] = [search(startCell, targets) for startCell, targets in queries]
+        elapsed = time.perf_counter() - start
+        print(f"  {name:<16} {elapsed / args.queries * 1000:9.2f} ms/query")
+
+    if len(set(map(tuple, lengths.values()))) != 1:
+        raise SystemExit("Path lengths differ between variants")
+    print("  all variants found paths of the same length")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Description: Reproducibility regression benchmark for RoombaModel.
+Runs a fixed set of seeds twice, checks that both runs follow the same
+trajectory and records the time of every step. A third run is saved to a
+checkpoint halfway and resumed from it, and must follow the same
+trajectory too. With --baseline FILE the
+trajectory hashes and timings are saved the first time and compared on
+later runs, so two engine variants can be checked on identical workloads.
+
+Run from this folder: python regression.py [--baseline regression.json]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import statistics
+import tempfile
+import time
+
+from simulacion.model import RoombaModel
+from simulacion.agent import Roomba
+from simulacion.checkpoint import saveCheckpoint, loadCheckpoint
+
+SEEDS = (0, 1, 2, 3, 4, 5, 6, 7)
+MODEL_PARAMS = {
+    "width": 20,
+    "height": 20,
+    "numAgents": 5,
+    "dirtPercentage": 0.3,
+    "obstaclePercentage": 0.2,
+    "maxTime": 1000,
+}
+
+def runTrajectory(seed, resumeAt=None):
+    """
+    Runs one seeded model to the end. With resumeAt, the model is saved
+    to a checkpoint after that many steps and the run continues with the
+    model loaded from it.
+    Returns:
+        The hash of every robot's cell and battery plus the dirt left at
+        each step, the number of steps and the seconds each step took.
+    """
+    model = RoombaModel(**MODEL_PARAMS, seed=seed)
+    roombas = [agent for agent in model.agents if isinstance(agent, Roomba)]
+    trajectory = hashlib.sha256()
+    stepTimes = []
+
+    while model.running:
+        if model.stepCount == resumeAt:
+            with tempfile.TemporaryDirectory() as path:
+                saveCheckpoint(model, path)
+                model = loadCheckpoint(path)
+            roombas = [agent for agent in model.agents if isinstance(agent, Roomba)]
+
+        start = time.perf_counter()
+        model.step()
+        stepTimes.append(time.perf_counter() - start)
+
+        state = [(roomba.cell.coordinate, roomba.batteryLevel) for roomba in roombas]
+        trajectory.update(repr((state, model.countDirt())).encode())
+
+    return trajectory.hexdigest(), model.stepCount, stepTimes
+
+def main():
+    parser = argparse.ArgumentParser(description="RoombaModel reproducibility regression benchmark.")
+    parser.add_argument("--baseline", default=None,
+                        help="JSON file to save results to, or to compare against if it exists")
+    args = parser.parse_args()
+
+    results = {}
+    failures = []
+    for seed in SEEDS:
+        firstHash, steps, stepTimes = runTrajectory(seed)
+        secondHash = runTrajectory(seed)[0]
+        if firstHash != secondHash:
+            failures.append(f"seed {seed}: two runs followed different trajectories")
+        resumedHash = runTrajectory(seed, resumeAt=steps // 2)[0]
+        if firstHash != resumedHash:
+            failures.append(f"seed {seed}: the run resumed from a checkpoint followed a different trajectory")
+
+        meanMs = statistics.mean(stepTimes) * 1000
+        results[str(seed)] = {"hash": firstHash, "steps": steps, "meanStepMs": meanMs}
+        print(f"seed {seed}: {steps:5d} steps, {meanMs:7.3f} ms/step, {firstHash[:12]}")
+
+    if args.baseline is not None:
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as file:
+                baseline = json.load(file)
+            for seed, result in results.items():
+                expected = baseline["runs"].get(seed)
+                if expected is None:
+                    continue
+                if expected["hash"] != result["hash"]:
+                    failures.append(f"seed {seed}: trajectory differs from {args.baseline}")
+                speedup = expected["meanStepMs"] / result["meanStepMs"]
+                print(f"seed {seed}: {speedup:5.2f}x the baseline speed")
+        else:
+            with open(args.baseline, "w") as file:
+                json.dump({"params": MODEL_PARAMS, "runs": results}, file, indent=2)
+            print(f"baseline saved to {args.baseline}")
+
+    if failures:
+        raise SystemExit("\n".join(failures))
+    print("all trajectories are reproducible")
+
+if __name__ == "__main__":
+    main()
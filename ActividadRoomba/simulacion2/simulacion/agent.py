@@ -4,8 +4,10 @@ Date: 19-11-2025
 Description: Agent definitions for Roomba Simulation 2 (Multi-Agent).
 """
 
+from collections import deque
+
 from mesa.discrete_space import CellAgent, FixedAgent
-import heapq
+from .pathfinding import findPath, findNearest
 
 class Obstacle(FixedAgent):
     """
@@ -14,17 +16,7 @@ class Obstacle(FixedAgent):
     def __init__(self, model, cell):
         super().__init__(model)
         self.cell = cell
-
-    def step(self):
-        pass
-
-class Dirt(FixedAgent):
-    """
-    Agent representing dirt in a cell.
-    """
-    def __init__(self, model, cell):
-        super().__init__(model)
-        self.cell = cell
+        model.obstacleCount += 1
 
     def step(self):
         pass
@@ -43,7 +35,7 @@ class ChargingStation(FixedAgent):
 class Roomba(CellAgent):
     """
     Robot agent that cleans the room.
-    Tracks individual statistics: steps taken and cells cleaned.
+    Tracks individual statistics: steps taken, moves made and cells cleaned.
     """
     def __init__(self, model, cell, unique_id):
         """
@@ -61,6 +53,19 @@ class Roomba(CellAgent):
         
         self.steps_taken = 0
         self.cleaned_cells = 0
+        self.moves_made = 0
+
+        # Cached path plan: remaining cells and where the agent must be to use it
+        self.planned_path = deque()
+        self.plan_cell = None
+
+        # Index of the region assigned by RoombaModel.allocateRegions, or
+        # None while unassigned or once the region has nothing left to explore
+        self.region = None
+
+        # Explored cells never become unexplored again, so once no
+        # unexplored cell is reachable the search is not repeated
+        self.explored_all = False
 
     def step(self):
         """
@@ -78,9 +83,9 @@ class Roomba(CellAgent):
         elif self.isCellDirty():
             self.cleanCell()
         
-        # Priority 4: Move randomly
+        # Priority 4: Explore
         else:
-            self.moveRandomly()
+            self.explore()
         
         self.steps_taken += 1
 
@@ -88,11 +93,7 @@ class Roomba(CellAgent):
         """
         Checks if the current cell has a ChargingStation.
         """
-        is_at_station = False
-        for agent in self.cell.agents:
-            if isinstance(agent, ChargingStation):
-                is_at_station = True
-        return is_at_station
+        return bool(self.model.stationMap[self.cell.coordinate])
 
     def chargeBattery(self):
         """
@@ -104,117 +105,141 @@ class Roomba(CellAgent):
 
     def isCellDirty(self):
         """
-        Checks if the current cell has Dirt.
+        Checks the model's dirt layer at the current cell.
         """
-        is_dirty = False
-        for agent in self.cell.agents:
-            if isinstance(agent, Dirt):
-                is_dirty = True
-        return is_dirty
+        return bool(self.model.dirtMap[self.cell.coordinate])
 
     def cleanCell(self):
         """
-        Removes Dirt agent from the current cell.
+        Clears the dirt bit of the current cell.
         Updates cleaned_cells metric.
         """
-        dirt_agent = None
-        for agent in self.cell.agents:
-            if isinstance(agent, Dirt) and dirt_agent is None:
-                dirt_agent = agent
-        
-        if dirt_agent is not None:
-            dirt_agent.remove()
+        if self.isCellDirty():
+            self.model.dirtMap[self.cell.coordinate] = False
+            self.model.dirtCount -= 1
             self.batteryLevel -= 1
             self.cleaned_cells += 1
+            self.model.cleanedCount += 1
+
+    def moveTo(self, next_cell):
+        """
+        Moves to next_cell, spending 1% battery.
+        """
+        self.cell = next_cell
+        self.batteryLevel -= 1
+        self.moves_made += 1
+        self.model.moveCount += 1
+
+    def explore(self):
+        """
+        Looks for dirt with the model's exploration strategy. With
+        "frontier" the current (clean) cell is marked explored on the
+        fleet's shared map and the agent heads to the nearest unexplored
+        cell, moving randomly once none is reachable. With "voronoi" it
+        first looks only inside its own region; when that is exhausted it
+        helps with the rest of the floor until regions are reallocated.
+        """
+        if self.model.exploration != "random":
+            self.model.visitedMap[self.cell.coordinate] = True
+
+            next_step = None
+            if self.region is not None:
+                next_step = self.nextFrontierStep(self.isUnexploredInRegion)
+                if next_step is None:
+                    self.region = None
+            if next_step is None and not self.explored_all:
+                next_step = self.nextFrontierStep(self.isUnexplored)
+                self.explored_all = next_step is None
+
+            if next_step is not None:
+                self.moveTo(next_step)
+                return
+
+        self.moveRandomly()
+
+    def isUnexplored(self, cell):
+        """
+        True if no Roomba has left the cell clean yet.
+        """
+        return not self.model.isExplored(cell)
+
+    def isUnexploredInRegion(self, cell):
+        """
+        True if the cell is unexplored and belongs to this agent's region.
+        """
+        return self.model.regionMap[cell.coordinate] == self.region and self.isUnexplored(cell)
 
     def moveRandomly(self):
         """
         Moves to a random neighbor that is not an Obstacle.
         """
-        valid_neighbors = []
-        for neighbor in self.cell.neighborhood:
-            is_obstacle = False
-            for agent in neighbor.agents:
-                if isinstance(agent, Obstacle):
-                    is_obstacle = True
-            
-            if not is_obstacle:
-                valid_neighbors.append(neighbor)
+        valid_neighbors = self.model.walkableNeighbors[self.cell]
 
         if len(valid_neighbors) > 0:
             next_cell = self.random.choice(valid_neighbors)
-            self.cell = next_cell
-            self.batteryLevel -= 1
+            self.moveTo(next_cell)
 
     def moveToNearestStation(self):
         """
-        Uses Dijkstra to find the nearest charging station and moves towards it.
+        Moves towards the nearest charging station, following the model's
+        distance field or searching with its pathPlanner.
         """
-        target_cells = []
-        for agent in self.model.agents:
-            if isinstance(agent, ChargingStation):
-                target_cells.append(agent.cell)
-        
-        if len(target_cells) > 0:
-            next_step = self.dijkstraNextStep(self.cell, target_cells)
-            
-            if next_step is not None and next_step != self.cell:
-                self.cell = next_step
-                self.batteryLevel -= 1
+        if len(self.model.stationCells) > 0:
+            if self.model.pathPlanner == "field":
+                next_step = self.model.stationNextHop.get(self.cell)
+            else:
+                use_a_star = self.model.pathPlanner == "astar"
+                next_step = self.nextPlannedStep(self.model.stationCells, use_a_star)
+
+            if next_step is not None:
+                self.moveTo(next_step)
         else:
             self.moveRandomly()
 
-    def dijkstraNextStep(self, start_cell, target_cells):
+    def nextPlannedStep(self, target_cells, use_a_star=False):
         """
-        Standard Dijkstra algorithm to find the next step towards the closest target.
+        Next cell of the cached path to the closest target (up to 50 steps
+        away). Searches again only when there is no plan, the agent left
+        it, its goal is no longer a target or its next cell is blocked.
         """
-        pq = []
-        heapq.heappush(pq, (0, id(start_cell), start_cell))
-        
-        came_from = {start_cell: None}
-        cost_so_far = {start_cell: 0}
-        closest_target = None
-        target_found = False
-        
-        while len(pq) > 0 and not target_found:
-            current_cost, _, current_cell = heapq.heappop(pq)
-            
-            is_target = False
-            for target in target_cells:
-                if current_cell == target:
-                    is_target = True
-            
-            if is_target:
-                closest_target = current_cell
-                target_found = True
-            else:
-                if current_cost < 50: 
-                    for neighbor in current_cell.neighborhood:
-                        is_obstacle = False
-                        for agent in neighbor.agents:
-                            if isinstance(agent, Obstacle):
-                                is_obstacle = True
-                        
-                        if not is_obstacle:
-                            new_cost = cost_so_far[current_cell] + 1
-                            if neighbor not in cost_so_far or new_cost < cost_so_far[neighbor]:
-                                cost_so_far[neighbor] = new_cost
-                                heapq.heappush(pq, (new_cost, id(neighbor), neighbor))
-                                came_from[neighbor] = current_cell
-        
+        plan_is_valid = (
+            len(self.planned_path) > 0
+            and self.plan_cell == self.cell
+            and self.planned_path[-1] in target_cells
+            and self.model.isWalkable(self.planned_path[0])
+        )
+
+        if not plan_is_valid:
+            path = findPath(self.cell, target_cells, self.model.walkableNeighbors, use_a_star, maxCost=50)
+            self.planned_path = deque(path or [])
+
         next_step = None
-        if closest_target is not None:
-            curr = closest_target
-            is_start = (curr == start_cell)
-            
-            while not is_start:
-                prev = came_from[curr]
-                if prev == start_cell:
-                    next_step = curr
-                    is_start = True
-                else:
-                    curr = prev
-                    if curr is None:
-                        is_start = True
+        if len(self.planned_path) > 0:
+            next_step = self.planned_path.popleft()
+        self.plan_cell = next_step
+        return next_step
+
+    def nextFrontierStep(self, is_target):
+        """
+        Next cell of the cached path to the nearest cell accepted by
+        is_target (an unexplored cell). Uses the same plan cache as
+        nextPlannedStep and runs a new BFS only when there is no plan, the
+        agent left it, its goal stopped being a target (explored by another
+        Roomba or moved to another region) or its next cell is blocked.
+        """
+        plan_is_valid = (
+            len(self.planned_path) > 0
+            and self.plan_cell == self.cell
+            and is_target(self.planned_path[-1])
+            and self.model.isWalkable(self.planned_path[0])
+        )
+
+        if not plan_is_valid:
+            path = findNearest(self.cell, is_target, self.model.walkableNeighbors)
+            self.planned_path = deque(path or [])
 
+        next_step = None
+        if len(self.planned_path) > 0:
+            next_step = self.planned_path.popleft()
+        self.plan_cell = next_step
         return next_step
\ No newline at end of file
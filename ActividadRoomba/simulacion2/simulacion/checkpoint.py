@@ -0,0 +1,257 @@
+"""
+Description: Checkpoint and resume for RoombaModel (Simulation 2).
+
+A checkpoint is a folder. meta.json holds the model parameters, the step
+counters and the state of both random number generators (model.random
+and model.rng); every array (obstacle, station and dirt layers, the
+known-clean and region maps, the robots and their cached paths) is a
+.npy file, which loadCheckpoint memory-maps instead of parsing.
+
+Stepping a resumed model gives step for step the same run as the model
+that was saved, so a long run can be stopped and picked up again, or
+forked into several what-if continuations (another maxTime, pathPlanner
+or exploration, or a new seed). Data collection starts over at the
+checkpoint step.
+"""
+
+import json
+import os
+
+import numpy as np
+
+from .agent import Roomba, Obstacle, ChargingStation
+from .engine import stationDistanceField
+from .model import RoombaModel
+
+FORMAT_VERSION = 1
+
+# Parameters a continuation may change; the floor and fleet are fixed
+RESUME_OVERRIDES = ("maxTime", "pathPlanner", "exploration", "allocationInterval", "sampleInterval", "seed")
+
+# One record per Roomba. region and planX/planY are -1 for None; the
+# planLength cells of its cached path follow each other in plans.npy.
+ROBOT_DTYPE = np.dtype([
+    ("x", np.int64), ("y", np.int64), ("battery", np.int64),
+    ("stepsTaken", np.int64), ("movesMade", np.int64), ("cleanedCells", np.int64),
+    ("region", np.int64), ("exploredAll", bool),
+    ("planX", np.int64), ("planY", np.int64), ("planLength", np.int64),
+])
+
+def saveCheckpoint(model, path):
+    """
+    Writes the full state of model to the folder path (created if
+    needed, existing files are replaced).
+    Args:
+        model: The RoombaModel to save.
+        path: Checkpoint folder.
+    """
+    os.makedirs(path, exist_ok=True)
+
+    meta = {
+        "version": FORMAT_VERSION,
+        "params": {
+            "width": model.width,
+            "height": model.height,
+            "maxTime": model.maxTime,
+            "pathPlanner": model.pathPlanner,
+            "exploration": model.exploration,
+            "allocationInterval": model.allocationInterval,
+            "engine": "agents" if model.engine is None else "fleet",
+            "sampleInterval": model.sampleInterval,
+            "seed": model._seed,
+        },
+        "counters": {
+            "steps": model.steps,
+            "stepCount": model.stepCount,
+            "running": model.running,
+            "dirtCount": model.dirtCount,
+            "obstacleCount": model.obstacleCount,
+            "moveCount": model.moveCount,
+            "cleanedCount": model.cleanedCount,
+        },
+        "random": model.random.getstate(),
+        "rng": model.rng.bit_generator.state,
+    }
+    with open(os.path.join(path, "meta.json"), "w") as file:
+        json.dump(meta, file)
+
+    if model.engine is not None:
+        arrays = saveFleet(model.engine)
+    else:
+        arrays = saveAgents(model)
+
+    for name, array in arrays.items():
+        np.save(os.path.join(path, f"{name}.npy"), array)
+
+def saveAgents(model):
+    """
+    Arrays of an agent-engine model: its layers, the stations in creation
+    order (the station field breaks ties by it) and the Roombas in
+    schedule order.
+    """
+    robots = np.zeros(len(model.roombas), dtype=ROBOT_DTYPE)
+    plans = []
+    for index, roomba in enumerate(model.roombas):
+        robot = robots[index]
+        robot["x"], robot["y"] = roomba.cell.coordinate
+        robot["battery"] = roomba.batteryLevel
+        robot["stepsTaken"] = roomba.steps_taken
+        robot["movesMade"] = roomba.moves_made
+        robot["cleanedCells"] = roomba.cleaned_cells
+        robot["region"] = -1 if roomba.region is None else roomba.region
+        robot["exploredAll"] = roomba.explored_all
+        robot["planX"], robot["planY"] = (-1, -1) if roomba.plan_cell is None else roomba.plan_cell.coordinate
+        robot["planLength"] = len(roomba.planned_path)
+        plans.extend(cell.coordinate for cell in roomba.planned_path)
+
+    return {
+        "obstacle": model.obstacleMap,
+        "dirt": model.dirtMap,
+        "visited": model.visitedMap,
+        "region": model.regionMap,
+        "stations": np.array([cell.coordinate for cell in model.stationCells], dtype=np.int64).reshape(-1, 2),
+        "robots": robots,
+        "plans": np.array(plans, dtype=np.int64).reshape(-1, 2),
+    }
+
+def saveFleet(engine):
+    """
+    Arrays of a fleet-engine model: its masks and the robot arrays.
+    """
+    robots = np.zeros(len(engine.x), dtype=ROBOT_DTYPE)
+    robots["x"] = engine.x
+    robots["y"] = engine.y
+    robots["battery"] = engine.battery
+    robots["stepsTaken"] = engine.stepsTaken
+    robots["movesMade"] = engine.movesMade
+    robots["cleanedCells"] = engine.cleanedCells
+    robots["region"] = robots["planX"] = robots["planY"] = -1
+
+    return {
+        "obstacle": engine.obstacleMap,
+        "dirt": engine.dirtMap,
+        "station": engine.stationMap,
+        "robots": robots,
+    }
+
+def loadCheckpoint(path, dataPath=None, chunkSize=1000, **overrides):
+    """
+    Rebuilds the model saved in the folder path.
+    Args:
+        path: Checkpoint folder written by saveCheckpoint.
+        dataPath: Where the resumed model streams its data, as in RoombaModel.
+        chunkSize: Collected steps buffered before each write to disk.
+        overrides: New values for the parameters in RESUME_OVERRIDES. A
+            new seed starts fresh random number generators instead of the
+            saved ones, so the continuation diverges from the saved run.
+    Returns:
+        RoombaModel: The resumed model.
+    """
+    unknown = sorted(set(overrides) - set(RESUME_OVERRIDES))
+    if unknown:
+        raise ValueError(f"Cannot override {unknown} when resuming, only {RESUME_OVERRIDES}")
+
+    with open(os.path.join(path, "meta.json")) as file:
+        meta = json.load(file)
+    if meta["version"] != FORMAT_VERSION:
+        raise ValueError(f"Unsupported checkpoint version {meta['version']}, expected {FORMAT_VERSION}")
+
+    def load(name):
+        # Copy-on-write: the model may change the arrays, the files stay as saved
+        return np.load(os.path.join(path, f"{name}.npy"), mmap_mode="c")
+
+    # An empty floor of the right size, then filled from the files
+    params = {**meta["params"], **overrides}
+    model = RoombaModel(numAgents=0, dirtPercentage=0, obstaclePercentage=0, **params)
+    robots = load("robots")
+    model.numAgents = len(robots)
+
+    if model.engine is not None:
+        loadFleet(model.engine, load, robots)
+    else:
+        loadAgents(model, load, robots)
+        if model.exploration == "voronoi":
+            if meta["params"]["exploration"] != "voronoi":
+                model.allocateRegions()
+        else:
+            # Saved regions would keep steering the Roombas of a fork that
+            # no longer reallocates them
+            model.regionMap.fill(-1)
+            for roomba in model.roombas:
+                roomba.region = None
+
+    counters = meta["counters"]
+    model.steps = counters["steps"]
+    model.stepCount = counters["stepCount"]
+    model.running = counters["running"]
+    model.dirtCount = counters["dirtCount"]
+    model.obstacleCount = counters["obstacleCount"]
+    model.moveCount = counters["moveCount"]
+    model.cleanedCount = counters["cleanedCount"]
+    if model.engine is not None:
+        model.engine.dirtCount = model.dirtCount
+        model.engine.moveCount = model.moveCount
+        model.engine.cleanedCount = model.cleanedCount
+
+    model.datacollector = model.createDataCollector(dataPath, chunkSize)
+    model.datacollector.collect(model)
+
+    # Last, so nothing above draws from the restored generators
+    if "seed" not in overrides:
+        version, internalState, gauss = meta["random"]
+        model.random.setstate((version, tuple(internalState), gauss))
+        model.rng.bit_generator.state = meta["rng"]
+
+    return model
+
+def loadAgents(model, load, robots):
+    """
+    Fills the empty grid of model: layers, Obstacle and ChargingStation
+    agents, then the Roombas in their saved order and state.
+    """
+    np.copyto(model.obstacleMap, load("obstacle"))
+    np.copyto(model.dirtMap, load("dirt"))
+    model.visitedMap = load("visited")
+    model.regionMap = load("region")
+
+    for x, y in np.argwhere(model.obstacleMap).tolist():
+        Obstacle(model, model.grid[(x, y)])
+
+    for x, y in load("stations").tolist():
+        ChargingStation(model, model.grid[(x, y)])
+        model.stationMap[x, y] = True
+
+    plans = load("plans").tolist()
+    planStart = 0
+    for index, robot in enumerate(robots.tolist()):
+        x, y, battery, stepsTaken, movesMade, cleanedCells, region, exploredAll, planX, planY, planLength = robot
+        roomba = Roomba(model, model.grid[(x, y)], unique_id=f"Roomba_{index}")
+        roomba.batteryLevel = battery
+        roomba.steps_taken = stepsTaken
+        roomba.moves_made = movesMade
+        roomba.cleaned_cells = cleanedCells
+        roomba.region = None if region == -1 else region
+        roomba.explored_all = exploredAll
+        roomba.plan_cell = None if planX == -1 else model.grid[(planX, planY)]
+        roomba.planned_path.extend(
+            model.grid[(cellX, cellY)] for cellX, cellY in plans[planStart:planStart + planLength]
+        )
+        planStart += planLength
+
+    model.buildNavigation()
+
+def loadFleet(engine, load, robots):
+    """
+    Replaces the arrays of an empty FleetEngine with the saved ones.
+    """
+    engine.obstacleMap = load("obstacle")
+    engine.dirtMap = load("dirt")
+    engine.stationMap = load("station")
+    engine.stationDistance = stationDistanceField(engine.obstacleMap, engine.stationMap)
+
+    engine.x = robots["x"].copy()
+    engine.y = robots["y"].copy()
+    engine.battery = robots["battery"].copy()
+    engine.stepsTaken = robots["stepsTaken"].copy()
+    engine.movesMade = robots["movesMade"].copy()
+    engine.cleanedCells = robots["cleanedCells"].copy()
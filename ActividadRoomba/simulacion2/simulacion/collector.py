@@ -0,0 +1,121 @@
+"""
+Description: On-disk data collector for long RoombaModel runs.
+
+StreamingCollector takes the same model_reporters and agenttype_reporters
+as Mesa's DataCollector, but instead of keeping every collected step in
+memory it buffers at most chunkSize steps and then appends them to CSV
+files: <output>.model.csv with one row per collected step and
+<output>.<AgentType>.csv (e.g. run.Roomba.csv) with one row per agent
+and step. Only the agent types given in agenttype_reporters are visited,
+so static agents are never touched. Memory stays bounded however long
+the run is.
+"""
+
+import csv
+import os
+
+import pandas as pd
+
+class StreamingCollector:
+    """
+    Append-only CSV collector, a drop-in for the DataCollector calls
+    RoombaModel makes (collect and the get_*_dataframe readers).
+    """
+    def __init__(self, output, model_reporters=None, agenttype_reporters=None, chunkSize=1000):
+        """
+        Args:
+            output: Path prefix of the CSV files; existing files are replaced.
+            model_reporters: Dict column name -> function(model).
+            agenttype_reporters: Dict agent class -> dict column name ->
+                attribute name or function(agent).
+            chunkSize: Collected steps kept in memory before they are
+                appended to the files.
+        """
+        self.output = output
+        self.model_reporters = model_reporters or {}
+        self.agenttype_reporters = agenttype_reporters or {}
+        self.chunkSize = chunkSize
+
+        self.modelRows = []
+        self.agentRows = {agentType: [] for agentType in self.agenttype_reporters}
+        self.bufferedSteps = 0
+
+        for path in [self.modelPath()] + [self.agentPath(agentType) for agentType in self.agentRows]:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def modelPath(self):
+        """CSV file of the model reporters."""
+        return f"{self.output}.model.csv"
+
+    def agentPath(self, agentType):
+        """CSV file of the reporters of one agent type."""
+        return f"{self.output}.{agentType.__name__}.csv"
+
+    def collect(self, model):
+        """
+        Records the current step and appends the buffer to disk once it
+        holds chunkSize steps.
+        """
+        step = model.steps
+        self.modelRows.append(
+            [step] + [reporter(model) for reporter in self.model_reporters.values()]
+        )
+
+        for agentType, reporters in self.agenttype_reporters.items():
+            rows = self.agentRows[agentType]
+            for agent in model.agents_by_type.get(agentType, []):
+                rows.append(
+                    [step, agent.unique_id]
+                    + [
+                        getattr(agent, reporter) if isinstance(reporter, str) else reporter(agent)
+                        for reporter in reporters.values()
+                    ]
+                )
+
+        self.bufferedSteps += 1
+        if self.bufferedSteps >= self.chunkSize:
+            self.flush()
+
+    def flush(self):
+        """
+        Appends the buffered rows to the CSV files and empties the buffer.
+        The header is written with the first chunk of each file.
+        """
+        self.appendRows(self.modelPath(), ["Step", *self.model_reporters], self.modelRows)
+        for agentType, rows in self.agentRows.items():
+            header = ["Step", "AgentID", *self.agenttype_reporters[agentType]]
+            self.appendRows(self.agentPath(agentType), header, rows)
+
+        self.bufferedSteps = 0
+
+    @staticmethod
+    def appendRows(path, header, rows):
+        """
+        Appends rows to path, writing header first if the file is new,
+        and clears rows.
+        """
+        newFile = not os.path.exists(path)
+        with open(path, "a", newline="") as file:
+            writer = csv.writer(file)
+            if newFile:
+                writer.writerow(header)
+            writer.writerows(rows)
+        rows.clear()
+
+    def get_model_vars_dataframe(self):
+        """
+        Flushes and reads every collected step back, indexed by step.
+        """
+        self.flush()
+        return pd.read_csv(self.modelPath(), index_col="Step")
+
+    def get_agenttype_vars_dataframe(self, agentType):
+        """
+        Flushes and reads the agent rows of agentType back, indexed by
+        step and agent id.
+        """
+        if agentType not in self.agenttype_reporters:
+            raise ValueError(f"No reporters were given for {agentType.__name__}, so none of its data was collected")
+        self.flush()
+        return pd.read_csv(self.agentPath(agentType), index_col=["Step", "AgentID"])
@@ -0,0 +1,204 @@
+"""
+Description: Vectorized fleet engine for RoombaModel (Simulation 2).
+
+FleetEngine keeps no Mesa grid and no agents: robot positions, battery
+levels and statistics are NumPy arrays with one entry per Roomba, and
+obstacles, dirt and stations are boolean (width, height) masks. Every
+tick the subsumption priorities of Roomba.step (charge, go home, clean,
+explore) are applied to the whole fleet at once with array operations,
+so a tick costs O(robots) however big the floor is.
+
+All robots decide from the state at the start of the tick instead of one
+after another in random order; when several robots share a dirty cell
+only one of them cleans it and the others explore. Exploration is a
+random walk. Runs are therefore not step-for-step identical to the agent
+engine with the same seed, only statistically equivalent.
+"""
+
+import numpy as np
+
+# Moore neighborhood, in the order of OrthogonalMooreGrid
+OFFSETS = np.array([(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)])
+
+# Station distance of cells from which no station can be reached
+UNREACHABLE = np.iinfo(np.int32).max
+
+def shiftSlices(offset, size):
+    """
+    Slices (destination, source) that move an axis of length size by
+    offset cells, dropping what falls off the border.
+    """
+    return slice(max(offset, 0), size + min(offset, 0)), slice(max(-offset, 0), size + min(-offset, 0))
+
+def stationDistanceField(obstacleMap, stationMap):
+    """
+    Steps from every cell to the nearest station over walkable Moore
+    neighbors. The BFS frontier is a boolean mask grown one ring per
+    iteration with shifted slices, so each ring is a few array operations.
+    Args:
+        obstacleMap: (width, height) bool array, True on obstacles.
+        stationMap: (width, height) bool array, True on stations.
+    Returns:
+        (width, height) int32 array, UNREACHABLE where no station can be reached.
+    """
+    width, height = obstacleMap.shape
+    walkable = ~obstacleMap
+    distance = np.full(obstacleMap.shape, UNREACHABLE, dtype=np.int32)
+
+    frontier = stationMap & walkable
+    reached = frontier.copy()
+    level = 0
+    while frontier.any():
+        distance[frontier] = level
+        grown = np.zeros_like(frontier)
+        for dx, dy in OFFSETS:
+            targetX, sourceX = shiftSlices(dx, width)
+            targetY, sourceY = shiftSlices(dy, height)
+            grown[targetX, targetY] |= frontier[sourceX, sourceY]
+        frontier = grown & walkable & ~reached
+        reached |= frontier
+        level += 1
+
+    return distance
+
+class FleetEngine:
+    """
+    The whole floor and fleet as arrays, stepped a tick at a time.
+    """
+    def __init__(self, width, height, numAgents, numObstacles, numDirt, rng,
+                 batteryThreshold=20):
+        """
+        Places stations (one per robot, with the robot on it), obstacles
+        and dirt on distinct random cells.
+        Args:
+            width: Grid width.
+            height: Grid height.
+            numAgents: Number of Roombas (and charging stations).
+            numObstacles: Number of obstacle cells.
+            numDirt: Number of dirty cells.
+            rng: numpy.random.Generator used for placement and movement.
+            batteryThreshold: Battery level under which a Roomba goes home.
+        """
+        self.width = width
+        self.height = height
+        self.rng = rng
+        self.batteryThreshold = batteryThreshold
+
+        # Cells are numbered x-major (x * height + y), like grid.all_cells
+        cells = rng.choice(width * height, size=numAgents + numObstacles + numDirt, replace=False)
+        stations = cells[:numAgents]
+        obstacles = cells[numAgents:numAgents + numObstacles]
+        dirt = cells[numAgents + numObstacles:]
+
+        self.stationMap = np.zeros((width, height), dtype=bool)
+        self.obstacleMap = np.zeros((width, height), dtype=bool)
+        self.dirtMap = np.zeros((width, height), dtype=bool)
+        self.stationMap.flat[stations] = True
+        self.obstacleMap.flat[obstacles] = True
+        self.dirtMap.flat[dirt] = True
+
+        # Stations and obstacles never move, so the way home is computed once
+        self.stationDistance = stationDistanceField(self.obstacleMap, self.stationMap)
+
+        # One entry per Roomba
+        self.x, self.y = np.divmod(stations, height)
+        self.battery = np.full(numAgents, 100, dtype=np.int64)
+        self.stepsTaken = np.zeros(numAgents, dtype=np.int64)
+        self.movesMade = np.zeros(numAgents, dtype=np.int64)
+        self.cleanedCells = np.zeros(numAgents, dtype=np.int64)
+
+        self.dirtCount = numDirt
+        self.moveCount = 0
+        self.cleanedCount = 0
+
+    def step(self):
+        """
+        Applies one tick of Roomba.step to every robot:
+        1. Charge (+5%, up to 100%) if at a station and not full.
+        2. Go home one step down the station distance field if below the
+           battery threshold.
+        3. Clean the current cell if it is dirty.
+        4. Move to a random walkable neighbor.
+        Moving and cleaning cost 1% battery.
+        """
+        x, y, battery = self.x, self.y, self.battery
+
+        charging = self.stationMap[x, y] & (battery < 100)
+        homing = ~charging & (battery < self.batteryThreshold)
+
+        # Only the first robot on each dirty cell cleans it
+        dirty = np.flatnonzero(~charging & ~homing & self.dirtMap[x, y])
+        _, first = np.unique(x[dirty] * self.height + y[dirty], return_index=True)
+        cleaners = dirty[first]
+        cleaning = np.zeros(len(x), dtype=bool)
+        cleaning[cleaners] = True
+        exploring = ~charging & ~homing & ~cleaning
+
+        np.minimum(battery + 5, 100, out=battery, where=charging)
+
+        self.dirtMap[x[cleaners], y[cleaners]] = False
+        battery[cleaners] -= 1
+        self.cleanedCells[cleaners] += 1
+        self.dirtCount -= len(cleaners)
+        self.cleanedCount += len(cleaners)
+
+        self.moveHome(np.flatnonzero(homing))
+        self.moveRandomly(np.flatnonzero(exploring))
+
+        self.stepsTaken += 1
+
+    def walkableNeighbors(self, robots):
+        """
+        Neighbor coordinates of the given robots.
+        Returns:
+            (neighborX, neighborY, walkable) arrays of shape (robots, 8);
+            coordinates outside the grid are clipped and not walkable.
+        """
+        neighborX = self.x[robots, None] + OFFSETS[:, 0]
+        neighborY = self.y[robots, None] + OFFSETS[:, 1]
+        inside = (neighborX >= 0) & (neighborX < self.width) & (neighborY >= 0) & (neighborY < self.height)
+        np.clip(neighborX, 0, self.width - 1, out=neighborX)
+        np.clip(neighborY, 0, self.height - 1, out=neighborY)
+        walkable = inside & ~self.obstacleMap[neighborX, neighborY]
+        return neighborX, neighborY, walkable
+
+    def moveHome(self, robots):
+        """
+        Moves each robot to the walkable neighbor closest to a station,
+        if it is closer than its current cell.
+        """
+        if len(robots) == 0:
+            return
+
+        neighborX, neighborY, walkable = self.walkableNeighbors(robots)
+        distance = np.where(walkable, self.stationDistance[neighborX, neighborY], UNREACHABLE)
+        best = distance.argmin(axis=1)
+        rows = np.arange(len(robots))
+        closer = distance[rows, best] < self.stationDistance[self.x[robots], self.y[robots]]
+
+        self.moveTo(robots[closer], neighborX[rows, best][closer], neighborY[rows, best][closer])
+
+    def moveRandomly(self, robots):
+        """
+        Moves each robot to a uniformly random walkable neighbor, if it has one.
+        """
+        if len(robots) == 0:
+            return
+
+        neighborX, neighborY, walkable = self.walkableNeighbors(robots)
+        keys = np.where(walkable, self.rng.random(walkable.shape), -1.0)
+        choice = keys.argmax(axis=1)
+        rows = np.arange(len(robots))
+        canMove = walkable.any(axis=1)
+
+        self.moveTo(robots[canMove], neighborX[rows, choice][canMove], neighborY[rows, choice][canMove])
+
+    def moveTo(self, robots, newX, newY):
+        """
+        Moves robots to (newX, newY), spending 1% battery each.
+        """
+        self.x[robots] = newX
+        self.y[robots] = newY
+        self.battery[robots] -= 1
+        self.movesMade[robots] += 1
+        self.moveCount += len(robots)
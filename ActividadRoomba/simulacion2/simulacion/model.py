@@ -4,16 +4,28 @@ Date: 19-11-2025
 Description: RoombaModel class for Simulation 2 (Multi-Agent).
 """
 
+from collections import deque
+
+import numpy as np
 from mesa import Model
+from mesa.agent import AgentSet
 from mesa.datacollection import DataCollector
 from mesa.discrete_space import OrthogonalMooreGrid
-from .agent import Roomba, Obstacle, Dirt, ChargingStation
+from .agent import Roomba, Obstacle, ChargingStation
+from .collector import StreamingCollector
+from .engine import FleetEngine
+
+PATH_PLANNERS = ("field", "dijkstra", "astar")
+EXPLORATION_STRATEGIES = ("random", "frontier", "voronoi")
+ENGINES = ("agents", "fleet")
 
 class RoombaModel(Model):
     """
     Model class for the Multi-Agent Roomba simulation.
     """
-    def __init__(self, width, height, numAgents, dirtPercentage, obstaclePercentage, maxTime):
+    def __init__(self, width, height, numAgents, dirtPercentage, obstaclePercentage, maxTime, pathPlanner="field",
+                 exploration="random", allocationInterval=10, engine="agents", dataPath=None,
+                 sampleInterval=1, chunkSize=1000, seed=None):
         """
         Initializes the simulation model.
         
@@ -24,63 +36,88 @@ class RoombaModel(Model):
             dirtPercentage: Percentage of dirty cells.
             obstaclePercentage: Percentage of obstacle cells.
             maxTime: Max steps.
+            pathPlanner: How low-battery Roombas find their way home:
+                "field" (precomputed distance field), "dijkstra" or "astar".
+            exploration: How Roombas look for dirt: "random" walk, or
+                "frontier" to head for the nearest cell no Roomba has left
+                clean yet (the known-clean map is shared by the fleet).
+                "voronoi" is frontier exploration where each Roomba first
+                clears its own region of the floor, so robots do not sweep
+                the same area.
+            allocationInterval: Steps between recomputing the "voronoi"
+                regions from the Roombas' current cells.
+            engine: "agents" builds the Mesa grid with one agent per Roomba,
+                station and obstacle. "fleet" builds neither and
+                steps the whole fleet as NumPy arrays (see FleetEngine), for
+                hundreds of robots on floors far larger than the
+                visualization can show; it only supports random exploration.
+                It has no Roomba agents, so no Roomba data is collected:
+                the per-robot statistics are the model.engine arrays
+                (battery, stepsTaken, cleanedCells).
+            dataPath: None keeps the collected data in memory (Mesa's
+                DataCollector, as the visualization needs). A path prefix
+                streams it to CSV files instead (see StreamingCollector),
+                for long runs.
+            sampleInterval: Collect data every this many steps.
+            chunkSize: Collected steps buffered before each write to disk.
+            seed: Seed for the model's random number generators.
         """
-        super().__init__()
+        if pathPlanner not in PATH_PLANNERS:
+            raise ValueError(f"Unknown pathPlanner {pathPlanner!r}, expected one of {PATH_PLANNERS}")
+        if exploration not in EXPLORATION_STRATEGIES:
+            raise ValueError(
+                f"Unknown exploration {exploration!r}, expected one of {EXPLORATION_STRATEGIES}"
+            )
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine {engine!r}, expected one of {ENGINES}")
+        if engine == "fleet" and exploration != "random":
+            raise ValueError("The fleet engine only supports random exploration")
+
+        super().__init__(seed=seed)
+        self.pathPlanner = pathPlanner
+        self.exploration = exploration
+        self.allocationInterval = allocationInterval
         self.numAgents = numAgents
-        self.grid = OrthogonalMooreGrid((width, height), torus=False, random=self.random)
+        self.width = width
+        self.height = height
         self.running = True
         self.maxTime = maxTime
+        self.sampleInterval = sampleInterval
         self.stepCount = 0
 
+        # Counters: obstacles count themselves, dirt is counted at placement
+        # and by Roomba.cleanCell
+        self.dirtCount = 0
+        self.obstacleCount = 0
+
+        # Fleet totals kept up to date by the Roombas
+        self.moveCount = 0
+        self.cleanedCount = 0
+
         totalCells = width * height
         numObstacles = int(totalCells * obstaclePercentage)
         numDirt = int(totalCells * dirtPercentage)
 
-        # --- Agent & Station Placement ---      
-        for i in range(self.numAgents):
-
-            pos_cell = self.find_valid_start_cell()
-            
-            if pos_cell:
-                ChargingStation(self, pos_cell)
-
-                Roomba(self, pos_cell, unique_id=f"Roomba_{i}")
-
-        # --- Obstacle Placement ---
-        obstaclesPlaced = 0
-        while obstaclesPlaced < numObstacles:
-            x = self.random.randrange(width)
-            y = self.random.randrange(height)
-            cell = self.grid[(x, y)]
-            
-            if cell.is_empty:
-                Obstacle(self, cell)
-                obstaclesPlaced += 1
-
-        # --- Dirt Placement ---
-        dirtPlaced = 0
-        while dirtPlaced < numDirt:
-            x = self.random.randrange(width)
-            y = self.random.randrange(height)
-            cell = self.grid[(x, y)]
-
-            if cell.is_empty:
-                Dirt(self, cell)
-                dirtPlaced += 1
+        # Every station, obstacle and dirt cell needs a cell of its own
+        if self.numAgents + numObstacles + numDirt > totalCells:
+            raise ValueError(
+                f"Cannot place {self.numAgents} stations, {numObstacles} obstacles and "
+                f"{numDirt} dirt cells on a {width}x{height} grid: lower numAgents, "
+                f"obstaclePercentage or dirtPercentage"
+            )
+
+        if engine == "fleet":
+            self.grid = None
+            self.roombas = AgentSet([], random=self.random)
+            self.engine = FleetEngine(width, height, numAgents, numObstacles, numDirt, self.rng)
+            self.dirtCount = numDirt
+            self.obstacleCount = numObstacles
+        else:
+            self.engine = None
+            self.placeAgents(numObstacles, numDirt)
 
         # --- Data Collection ---
-        self.datacollector = DataCollector(
-            model_reporters={
-                "CleanPercentage": self.getCleanPercentage,
-                "DirtyCells": lambda m: m.countDirt(),
-                "Steps": lambda m: m.stepCount
-            },
-            agent_reporters={
-                "StepsTaken": lambda a: a.steps_taken if isinstance(a, Roomba) else 0,
-                "CellsCleaned": lambda a: a.cleaned_cells if isinstance(a, Roomba) else 0,
-                "Battery": lambda a: a.batteryLevel if isinstance(a, Roomba) else 0
-            }
-        )
+        self.datacollector = self.createDataCollector(dataPath, chunkSize)
         
         self.datacollector.collect(self)
 
@@ -89,47 +126,225 @@ class RoombaModel(Model):
         Advances the model by one step.
         """
         self.stepCount += 1
+
+        if self.exploration == "voronoi" and self.stepCount % self.allocationInterval == 0:
+            self.allocateRegions()
         
-        self.agents.shuffle_do("step")
+        if self.engine is not None:
+            self.stepEngine()
+        else:
+            self.roombas.shuffle_do("step")
         
-        self.datacollector.collect(self)
+        if self.stepCount % self.sampleInterval == 0:
+            self.datacollector.collect(self)
 
         if self.countDirt() == 0 or self.stepCount >= self.maxTime:
             self.running = False
+            # The last step is always recorded, so the final state and the
+            # time to clean are never dropped by the sampling
+            if self.stepCount % self.sampleInterval != 0:
+                self.datacollector.collect(self)
+            if isinstance(self.datacollector, StreamingCollector):
+                self.datacollector.flush()
+
+    def stepEngine(self):
+        """
+        Steps the fleet engine and copies its counters to the model.
+        """
+        self.engine.step()
+        self.dirtCount = self.engine.dirtCount
+        self.moveCount = self.engine.moveCount
+        self.cleanedCount = self.engine.cleanedCount
+
+    def placeAgents(self, numObstacles, numDirt):
+        """
+        Builds the grid and places the Roombas on their stations, the
+        obstacles and the dirt, then precomputes the walkable neighbors,
+        the navigation data and (for "voronoi") the regions.
+        """
+        width, height = self.width, self.height
+        self.grid = OrthogonalMooreGrid((width, height), torus=False, random=self.random)
+
+        # Per-cell layers (Mesa property layers), so Roombas never scan
+        # cell.agents: True where an Obstacle, a ChargingStation or dirt is.
+        # Dirt is only a bit here, cleaning a cell clears it.
+        self.obstacleMap = self.grid.create_property_layer("obstacle", False, dtype=bool).data
+        self.stationMap = self.grid.create_property_layer("station", False, dtype=bool).data
+        self.dirtMap = self.grid.create_property_layer("dirt", False, dtype=bool).data
+
+        # Known-clean map shared by the fleet: True where a Roomba found no
+        # dirt left when it set off exploring
+        self.visitedMap = np.zeros((width, height), dtype=bool)
+
+        # Task allocation: index of the Roomba whose region each cell is in,
+        # -1 where no Roomba can reach
+        self.regionMap = np.full((width, height), -1, dtype=int)
+
+        # --- Agent & Station Placement ---
+        for i, pos_cell in enumerate(self.sampleEmptyCells(self.numAgents)):
+            ChargingStation(self, pos_cell)
+            self.stationMap[pos_cell.coordinate] = True
+
+            Roomba(self, pos_cell, unique_id=f"Roomba_{i}")
+
+        # --- Obstacle & Dirt Placement ---
+        # One sample of distinct empty cells: the first ones get obstacles,
+        # the rest dirt.
+        freeCells = self.sampleEmptyCells(numObstacles + numDirt)
+
+        for cell in freeCells[:numObstacles]:
+            Obstacle(self, cell)
+            self.obstacleMap[cell.coordinate] = True
+
+        for cell in freeCells[numObstacles:]:
+            self.dirtMap[cell.coordinate] = True
+        self.dirtCount = numDirt
+
+        self.buildNavigation()
 
-    def find_valid_start_cell(self):
+        # --- Task Allocation ---
+        if self.exploration == "voronoi":
+            self.allocateRegions()
+
+    def buildNavigation(self):
         """
-        Finds a random cell that is currently empty of any agents.
-        Retries until valid or gives up.
+        Precomputes, from the placed obstacles and stations, the walkable
+        neighbors of every cell and the station distance field, and
+        collects the Roombas to schedule.
         """
-        for _ in range(100):
-            x = self.random.randrange(self.grid.width)
-            y = self.random.randrange(self.grid.height)
-            cell = self.grid[(x, y)]
-            
-            if cell.is_empty:
-                return cell
-        return None
+        # --- Walkable Neighbors ---
+        # Obstacles never move, so each cell's enterable neighbors are listed
+        # once (in neighborhood order) for movement and pathfinding.
+        self.walkableNeighbors = {
+            cell: [neighbor for neighbor in cell.neighborhood if self.isWalkable(neighbor)]
+            for cell in self.grid.all_cells
+        }
+
+        # --- Station Distance Field ---
+        # Stations and obstacles never move, so the way home from every cell
+        # is computed once here instead of on every homing step.
+        self.stationCells = [
+            agent.cell for agent in self.agents if isinstance(agent, ChargingStation)
+        ]
+        self.stationDistance, self.stationNextHop = self.buildStationField()
+
+        # --- Schedule ---
+        # Only Roombas act; stepping the static agents would do nothing
+        self.roombas = AgentSet(
+            [agent for agent in self.agents if isinstance(agent, Roomba)], random=self.random
+        )
+
+    def createDataCollector(self, dataPath=None, chunkSize=1000):
+        """
+        Creates the collector of the model and Roomba reporters: Mesa's
+        DataCollector, or a StreamingCollector writing to dataPath.
+        """
+        # Only Roombas are recorded, and only the agents engine has them:
+        # asking a fleet model for Roomba data fails instead of returning
+        # an empty table
+        reporters = {
+            "model_reporters": {
+                "CleanPercentage": self.getCleanPercentage,
+                "CoverageEfficiency": self.getCoverageEfficiency,
+                "DirtyCells": lambda m: m.countDirt(),
+                "Steps": lambda m: m.stepCount
+            },
+            "agenttype_reporters": {}
+        }
+        if self.engine is None:
+            reporters["agenttype_reporters"][Roomba] = {
+                "StepsTaken": "steps_taken",
+                "CellsCleaned": "cleaned_cells",
+                "Battery": "batteryLevel"
+            }
+        if dataPath is None:
+            return DataCollector(**reporters)
+        return StreamingCollector(dataPath, chunkSize=chunkSize, **reporters)
+
+    def sampleEmptyCells(self, count):
+        """
+        Picks count distinct random cells that hold no agent, in one pass
+        over the grid instead of retrying random coordinates.
+        Args:
+            count: Number of cells to pick.
+        Returns:
+            A list of count cells in random order.
+        """
+        emptyCells = [cell for cell in self.grid.all_cells if cell.is_empty]
+        if count > len(emptyCells):
+            raise ValueError(f"Cannot pick {count} empty cells, only {len(emptyCells)} are left")
+        return self.random.sample(emptyCells, count)
+
+    def buildStationField(self):
+        """
+        Runs one multi-source BFS from every ChargingStation over the cells
+        that are not obstacles.
+        Returns:
+            stationDistance: dict Cell -> steps to the nearest station.
+            stationNextHop: dict Cell -> neighbor Cell one step closer to it.
+        """
+        stationDistance = {}
+        stationNextHop = {}
+        queue = deque()
+
+        for stationCell in self.stationCells:
+            stationDistance[stationCell] = 0
+            queue.append(stationCell)
+
+        while len(queue) > 0:
+            currentCell = queue.popleft()
+            for neighbor in self.walkableNeighbors[currentCell]:
+                if neighbor not in stationDistance:
+                    stationDistance[neighbor] = stationDistance[currentCell] + 1
+                    stationNextHop[neighbor] = currentCell
+                    queue.append(neighbor)
+
+        return stationDistance, stationNextHop
+
+    def allocateRegions(self):
+        """
+        Splits the floor among the Roombas into Voronoi regions over path
+        distance: one multi-source BFS from every Roomba's cell gives each
+        reachable cell to the closest robot (ties go to the lower index).
+        Every Roomba gets its region back, including those that had given
+        up on an exhausted one.
+        """
+        self.regionMap.fill(-1)
+        queue = deque()
+
+        for index, roomba in enumerate(self.roombas):
+            roomba.region = index
+            if self.regionMap[roomba.cell.coordinate] == -1:
+                self.regionMap[roomba.cell.coordinate] = index
+                queue.append(roomba.cell)
+
+        while len(queue) > 0:
+            currentCell = queue.popleft()
+            region = self.regionMap[currentCell.coordinate]
+            for neighbor in self.walkableNeighbors[currentCell]:
+                if self.regionMap[neighbor.coordinate] == -1:
+                    self.regionMap[neighbor.coordinate] = region
+                    queue.append(neighbor)
+
+    def isWalkable(self, cell):
+        """Checks the occupancy bitmap: True if the cell has no Obstacle."""
+        return not self.obstacleMap[cell.coordinate]
 
     def countDirt(self):
-        """Counts Dirt agents using self.agents"""
-        count = 0
-        for agent in self.agents:
-            if isinstance(agent, Dirt):
-                count += 1
-        return count
+        """Number of dirty cells left."""
+        return self.dirtCount
+
+    def isExplored(self, cell):
+        """Checks the known-clean map: True if a Roomba has left the cell clean."""
+        return self.visitedMap[cell.coordinate]
 
     def countObstacles(self):
-        """Counts Obstacle agents using self.agents"""
-        count = 0
-        for agent in self.agents:
-            if isinstance(agent, Obstacle):
-                count += 1
-        return count
+        """Number of Obstacle agents in the model."""
+        return self.obstacleCount
 
     @staticmethod
     def getCleanPercentage(model):
-        totalCells = model.grid.width * model.grid.height
+        totalCells = model.width * model.height
         obstacles = model.countObstacles()
         dirt = model.countDirt()
         
@@ -139,4 +354,14 @@ class RoombaModel(Model):
             cleanCells = cleanableCells - dirt
             return (cleanCells / cleanableCells) * 100
         else:
-            return 100.0
\ No newline at end of file
+            return 100.0
+
+    @staticmethod
+    def getCoverageEfficiency(model):
+        """
+        Moves the fleet made per cell it cleaned (lower is better).
+        Returns 0 until the first cell is cleaned.
+        """
+        if model.cleanedCount == 0:
+            return 0.0
+        return model.moveCount / model.cleanedCount
\ No newline at end of file